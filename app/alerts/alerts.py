@@ -161,3 +161,10 @@ def send_via_brevo(to, subject, message, content, api_key):
 
     except Exception as e:
         print(f"[Brevo Error] {e}")
+
+def triggered_tickers():
+    """Tickers whose alerts fired this session, plus scanner hits."""
+    tickers = {t for t, _ in st.session_state.get("triggered_alerts", ())}
+    for alert in load_alerts()[1]:
+        tickers.update(alert.get("triggered", []))
+    return sorted(tickers)
@@ -249,7 +249,7 @@ def show_edit_modal(view, config, wl):
         ticker_val = st.session_state.get(f"alert_ticker{suffix}", "").strip()
         recipients = st.session_state.get(f"alert_recipients{suffix}", "").splitlines() if channel in ("email", "webhook") else []
         username = st.session_state.get(f"alert_username{suffix}", "").strip() if channel == "webhook" else None
-        test = view.expr(expr)
+        test = view.expr_mask(expr)
         if alert_type == "ticker" and ticker_val.upper() not in wl:
             st.error(f"❌ Ticker '{ticker_val.upper()}' not found in watchlist file.")
             return
@@ -1,12 +1,12 @@
 import json
 import time
-import pandas as pd
 import requests
 from datetime import datetime
 import yaml
-import os
-import yfinance as yf
-import numpy as np
+from core.datafetch import is_market_open, load_all_tickers
+from core.snapshot import SnapshotBuilder
+from core.snapshot_store import publish_snapshot
+from core.polygon_bulk import bulk_from_config
 
 ALERTS_FILE = "alerts/alerts.json"
 CONFIG_PATH = "config.yaml"
@@ -20,88 +20,16 @@ def load_alerts(path=ALERTS_FILE):
         data = json.load(f)
     return data.get("tickers", {}), data.get("scanners", [])
 
-def fetch_all_tickers_df():
-    watchlists_dir = "watchlists"
-    tickers = set()
-    for fname in os.listdir(watchlists_dir):
-        if fname.endswith(".txt"):
-            with open(os.path.join(watchlists_dir, fname)) as f:
-                for line in f:
-                    t = line.strip().upper()
-                    if t:
-                        tickers.add(t)
-    tickers = list(tickers)
-    if not tickers:
-        raise ValueError("No tickers found in watchlists.")
-
-    # Download last 30 days for indicators
-    df = yf.download(tickers, period="30d", group_by='ticker', threads=True, auto_adjust=True)
-    rows = []
-    for tkr in tickers:
-        try:
-            h = df[tkr] if isinstance(df.columns, pd.MultiIndex) else df
-            h = h.dropna()
-            if len(h) < 15:
-                continue
-
-            # Calculate RSI (14)
-            delta = h["Close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            h["RSI"] = rsi
-
-            # Calculate MACD
-            ema12 = h["Close"].ewm(span=12, adjust=False).mean()
-            ema26 = h["Close"].ewm(span=26, adjust=False).mean()
-            macd = ema12 - ema26
-            signal = macd.ewm(span=9, adjust=False).mean()
-            macd_diff = macd - signal
-            h["MACD"] = macd
-            h["MACD_diff"] = macd_diff
-
-            last = h.iloc[-1]
-            prev_close = h["Close"].iloc[-2] if len(h) >= 2 else None
-            percent_change = ((last["Close"] - prev_close) / prev_close) * 100 if prev_close else None
-
-
-            # Average Volume (last 20 days)
-            avg_vol = h["Volume"].rolling(20).mean().iloc[-1] if len(h) >= 20 else h["Volume"].mean()
-
-            # Market Cap and Float from yfinance info
-            info = {}
-            try:
-                yf_ticker = yf.Ticker(tkr)
-                info = yf_ticker.info
-            except Exception:
-                pass
-            mcap = info.get("marketCap", None)
-            float_shares = info.get("floatShares", None)
-            pe_ratio = info.get("trailingPE", None),
-            eps = info.get("trailingEps", None)
-            
-
-
-            rows.append({
-            "Ticker":        tkr,
-            "Price":         last["Close"],
-            "RSI":           last["RSI"],
-            "MACD":          last["MACD_diff"],
-            "Volume":        last["Volume"],
-            "Avg Vol":       avg_vol,
-            "Market Cap":    mcap,
-            "Float":         float_shares,
-            "PE Ratio":      pe_ratio,
-            "EPS":           eps,
-            "PercentChange": percent_change,
-        })
+snapshot_builder = SnapshotBuilder()
 
-        except Exception as e:
-            print(f"[Data Error] {tkr}: {e}")
-            continue
-    result_df = pd.DataFrame(rows)
-    return result_df
+def fetch_all_tickers_df():
+    tickers = load_all_tickers()
+    # Same history window and indicator code as the UI, so alerts and the grid agree
+    df = snapshot_builder.build(tickers, fast=is_market_open())
+    version = publish_snapshot(df, universe=tickers)
+    if version:
+        print(f"[Daemon] Published snapshot v{version} ({len(df)} tickers)")
+    return df
 
 def check_alerts(df, config):
     tickers, scanners = load_alerts()
@@ -255,9 +183,12 @@ def send_via_brevo(to, subject, message, content, api_key):
 
 def main():
     config = load_config()
+    snapshot_builder.scheduler.configure(config.get("refresh_tiers"))
+    snapshot_builder.bulk = bulk_from_config(config)
     print("[Daemon] Starting alerts daemon...")
     while True:
         try:
+            snapshot_builder.scheduler.hint(alerts=load_alerts()[0].keys())
             df = fetch_all_tickers_df()
             check_alerts(df, config)
             print(f"[Daemon] Alerts checked. {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -0,0 +1,128 @@
+"""
+Check PolygonBulk against a local stand-in for the Polygon API (http.server, no key or
+network needed): the snapshot path, the fallback to grouped daily bars when the plan
+returns 401/403 for snapshots (and that later refreshes don't re-poll what can't change),
+that every request goes through the shared Polygon rate budget, and patch_quotes.
+Run from app/:  python -m benchmarks.polygon_bulk_check
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import pandas as pd
+import pytz
+from core import ratelimit
+from core.polygon_bulk import PolygonBulk, patch_quotes
+
+KEY = "test-key"
+
+SNAPSHOT = [
+    {"ticker": "AAA", "lastTrade": {"p": 11.0, "t": 1_700_000_000_000_000_000},
+     "min": {"av": 5000, "c": 10.9}, "day": {"c": 10.5, "v": 4000}, "prevDay": {"c": 10.0}},
+    {"ticker": "BBB", "min": {"c": 4.5}, "day": {"v": 900}, "prevDay": {"c": 5.0}, "updated": 1_700_000_000_000},
+    {"ticker": "ZZZ", "lastTrade": {"p": 1.0}, "prevDay": {"c": 1.0}},  # not in the watchlist
+]
+
+class StandIn(BaseHTTPRequestHandler):
+    snapshot_status = 200  # 403 = plan without snapshots
+    calls = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+        StandIn.calls.append(url.path)
+        if qs.get("apiKey") != [KEY]:
+            return self._send(401, {"status": "ERROR"})
+        if url.path == "/v2/snapshot/locale/us/markets/stocks/tickers":
+            if StandIn.snapshot_status != 200:
+                return self._send(StandIn.snapshot_status, {"status": "NOT_AUTHORIZED"})
+            wanted = set(qs["tickers"][0].split(",")) if "tickers" in qs else None
+            return self._send(200, {"tickers": [r for r in SNAPSHOT if wanted is None or r["ticker"] in wanted]})
+        if url.path.startswith("/v2/aggs/grouped/locale/us/market/stocks/"):
+            # today closes at 12, every earlier day at 10 (so +20%); BBB only traded today
+            today = url.path.endswith(str(datetime.now(pytz.timezone("US/Eastern")).date()))
+            rows = [{"T": "AAA", "c": 12.0 if today else 10.0, "v": 700}]
+            if today:
+                rows.append({"T": "BBB", "c": 3.0, "v": 50})
+            return self._send(200, {"results": rows})
+        self._send(404, {})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def check(label, cond):
+    print(f"{'ok  ' if cond else 'FAIL'} {label}")
+    return cond
+
+class CountingBucket:
+    def __init__(self):
+        self.taken = 0
+
+    def take(self):
+        self.taken += 1
+
+def main():
+    bucket = ratelimit.upstream["polygon"] = CountingBucket()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bulk = PolygonBulk(KEY, base_url=f"http://127.0.0.1:{server.server_port}")
+    ok = True
+
+    q = bulk.quotes(["AAA", "BBB", "CCC"])
+    ok &= check("snapshot: one request", StandIn.calls == ["/v2/snapshot/locale/us/markets/stocks/tickers"])
+    ok &= check("snapshot: only watchlist tickers with a price", sorted(q) == ["AAA", "BBB"])
+    ok &= check("snapshot: last trade, accumulated volume, % vs prev close",
+                q["AAA"]["Price"] == 11.0 and q["AAA"]["Volume"] == 5000 and abs(q["AAA"]["Pct Change"] - 10) < 1e-9)
+    ok &= check("snapshot: minute close when there is no last trade", q["BBB"]["Price"] == 4.5 and q["BBB"]["Pct Change"] == -10)
+    ok &= check("snapshot: date from the trade timestamp", q["AAA"]["date"] == "2023-11-14")
+
+    ok &= check("rate budget: one token per request", bucket.taken == len(StandIn.calls))
+
+    for status in (401, 403):
+        fallback = PolygonBulk(KEY, base_url=bulk.base_url)
+        StandIn.snapshot_status, StandIn.calls = status, []
+        q = fallback.quotes(["AAA", "BBB"])
+        grouped = [c for c in StandIn.calls if "/grouped/" in c]
+        ok &= check(f"{status}: falls back to grouped daily (today + previous day)", len(grouped) == 2)
+        ok &= check(f"{status}: close and % change from the two days",
+                    q["AAA"]["Price"] == 12.0 and abs(q["AAA"]["Pct Change"] - 20) < 1e-9)
+        ok &= check(f"{status}: no previous bar -> no % change", q["BBB"]["Pct Change"] is None)
+        StandIn.calls = []
+        again = fallback.quotes(["AAA", "BBB"])
+        ok &= check(f"{status}: next refresh asks nothing (no snapshot retry, days cached)",
+                    StandIn.calls == [] and again == q)
+
+    StandIn.snapshot_status = 500
+    try:
+        bulk.quotes(["AAA"])
+        ok &= check("500: raised, no fallback", False)
+    except Exception as e:
+        ok &= check("500: raised, no fallback", "500" in str(e))
+
+    df = pd.DataFrame({"Ticker": ["AAA", "BBB", "CCC"], "Price": [1.0, 2.0, 3.0],
+                       "Volume": [10, 20, 30], "Pct Change": [0.1, 0.2, 0.3], "RSI": [40, 50, 60]})
+    patched = patch_quotes(df, {"AAA": {"Price": 11.0, "Volume": 5000.0, "Pct Change": 10.0},
+                                "BBB": {"Price": 4.5, "Volume": 900.0, "Pct Change": None}})
+    ok &= check("patch_quotes: quoted tickers updated",
+                patched.loc[0, ["Price", "Volume", "Pct Change"]].tolist() == [11.0, 5000.0, 10.0])
+    ok &= check("patch_quotes: missing fields keep the old value",
+                patched.loc[1, "Price"] == 4.5 and patched.loc[1, "Pct Change"] == 0.2)
+    ok &= check("patch_quotes: unquoted tickers and other columns untouched",
+                patched.loc[2, "Price"] == 3.0 and patched["RSI"].tolist() == [40, 50, 60])
+    ok &= check("patch_quotes: input frame not modified", df.loc[0, "Price"] == 1.0)
+
+    server.shutdown()
+    print("all checks passed" if ok else "SOME CHECKS FAILED")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+FinBERT backends compared on CPU: load time, memory (RSS) and headlines/sec, plus label
+agreement with the torch pipeline. Each backend runs in its own process so RSS is clean.
+Run from app/:  python -m benchmarks.sentiment_bench [headlines] [backends...]
+e.g. python -m benchmarks.sentiment_bench 512 torch int8 onnx
+
+Tolerance: a backend is OK to switch to if >= 98% of labels match torch and the mean
+|score difference| is <= 0.02.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from core import sentiment
+from core.newsstore import NEWS_DB
+
+LABEL_AGREEMENT = 0.98
+SCORE_DIFF = 0.02
+
+SAMPLE = [
+    "Company beats quarterly earnings estimates and raises full-year guidance",
+    "Shares plunge after FDA rejects drug application",
+    "Stock edges higher ahead of Fed decision",
+    "Firm announces $500 million share buyback program",
+    "CEO resigns amid accounting investigation",
+    "Analysts downgrade stock to sell on weak demand outlook",
+    "Company reports record revenue but margins shrink",
+    "Biotech soars after positive phase 3 trial results",
+    "Retailer to close 150 stores as sales decline",
+    "Chipmaker signs multi-year supply deal with major automaker",
+    "Oil prices steady as traders await inventory data",
+    "Short seller report sends shares tumbling",
+    "Company completes acquisition of rival for $2.1 billion",
+    "Quarterly loss widens on higher costs",
+    "Dividend increased by 10 percent",
+    "Trading halted pending news",
+]
+
+def headlines(n):
+    """Stored headlines if the news daemon has run, else the built-in sample, repeated to n."""
+    titles = []
+    if os.path.exists(NEWS_DB):
+        con = sqlite3.connect(NEWS_DB)
+        titles = [r[0] for r in con.execute("SELECT title FROM articles ORDER BY published DESC LIMIT ?", (n,))]
+        con.close()
+    titles = titles or SAMPLE
+    return (titles * (n // len(titles) + 1))[:n]
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        import resource  # Unix only; peak rather than current
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def child(backend, n):
+    texts = headlines(n)
+    base = rss_mb()
+    t0 = time.perf_counter()
+    pipe = sentiment.load_pipeline(backend)
+    load = time.perf_counter() - t0
+    pipe(texts[:8], batch_size=8, truncation=True)  # warm-up
+    t0 = time.perf_counter()
+    out = pipe(texts, batch_size=sentiment.BATCH_SIZE, truncation=True)
+    run = time.perf_counter() - t0
+    print(json.dumps({
+        "load_s": load,
+        "rss_mb": rss_mb() - base,
+        "per_sec": len(texts) / run,
+        "labels": [o["label"].lower() for o in out],
+        "scores": [float(o["score"]) for o in out],
+    }))
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        return child(args[1], int(args[2]))
+
+    n = int(args[0]) if args else 256
+    backends = args[1:] or list(sentiment.BACKENDS)
+    if "torch" not in backends:
+        backends.insert(0, "torch")  # the reference
+
+    results = {}
+    for b in backends:
+        p = subprocess.run([sys.executable, "-m", "benchmarks.sentiment_bench", "--child", b, str(n)],
+                           capture_output=True, text=True)
+        lines = [l for l in p.stdout.splitlines() if l.startswith("{")]
+        if p.returncode or not lines:
+            print(f"{b:6s} failed: {(p.stderr.strip().splitlines() or ['?'])[-1]}")
+            continue
+        results[b] = json.loads(lines[-1])
+
+    ref = results.get("torch")
+    print(f"{n} headlines, batch {sentiment.BATCH_SIZE}")
+    print(f"{'backend':8s} {'load s':>8s} {'RSS MB':>8s} {'hl/s':>8s} {'labels':>8s} {'|dscore|':>9s}")
+    for b, r in results.items():
+        agree = diff = None
+        if ref:
+            agree = sum(a == c for a, c in zip(r["labels"], ref["labels"])) / len(ref["labels"])
+            diff = sum(abs(a - c) for a, c in zip(r["scores"], ref["scores"])) / len(ref["scores"])
+        ok = "" if b == "torch" or agree is None else (
+            "  ok" if agree >= LABEL_AGREEMENT and diff <= SCORE_DIFF else "  outside tolerance")
+        print(f"{b:8s} {r['load_s']:8.1f} {r['rss_mb']:8.0f} {r['per_sec']:8.1f} "
+              f"{agree if agree is not None else float('nan'):8.1%} {diff if diff is not None else float('nan'):9.4f}{ok}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Startup import cost of main.py, from `python -X importtime`.
+Runs main.py's top-level imports (not the page itself) in a fresh interpreter, prints the
+total and the slowest top-level packages, and lists which heavy libraries got pulled in.
+Run from app/:  python -m benchmarks.startup_bench [--eager] [--top N]
+--eager also imports the heavy libraries up front, i.e. what startup cost before they
+were made lazy.
+"""
+import ast
+import subprocess
+import sys
+
+# (streamlit itself imports plotly.graph_objects for st.plotly_chart, so that one always shows up)
+HEAVY = ["yfinance", "plotly.graph_objects", "st_aggrid", "transformers", "torch"]
+EAGER = ["yfinance", "plotly.graph_objects", "st_aggrid", "transformers.pipelines"]
+
+def main_imports(path="main.py"):
+    """The module-level import statements of main.py, as source."""
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    tree = ast.parse(src)
+    return [ast.get_source_segment(src, n) for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+
+def importtime(code):
+    """{module: (self_us, cumulative_us, depth)} for one fresh interpreter running code."""
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    mods = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        mods.setdefault(name.strip(), (int(self_us), int(cum_us), depth))
+    if p.returncode:
+        print(p.stderr.strip().splitlines()[-1])
+    return mods
+
+def report(label, code, top):
+    mods = importtime(code)
+    roots = sorted(((cum, m) for m, (_, cum, depth) in mods.items() if depth == 0), reverse=True)
+    total = sum(cum for cum, _ in roots)
+    print(f"== {label}: {total / 1e6:.2f}s in imports, {len(mods)} modules")
+    for cum, m in roots[:top]:
+        print(f"  {cum / 1e3:9.1f} ms  {m}")
+    loaded = [h for h in HEAVY if h in mods]
+    print(f"  heavy libraries loaded: {', '.join(loaded) or 'none'}")
+    return total
+
+def main():
+    args = sys.argv[1:]
+    top = int(args[args.index("--top") + 1]) if "--top" in args else 15
+    imports = "\n".join(main_imports())
+    lazy = report("main.py imports", imports, top)
+    if "--eager" in args:
+        eager_code = imports + "\n" + "\n".join(f"import {m}" for m in EAGER)
+        eager = report("main.py imports + heavy libraries up front", eager_code, top)
+        print(f"\nlazy imports save {(eager - lazy) / 1e6:.2f}s per cold start")
+
+if __name__ == "__main__":
+    main()
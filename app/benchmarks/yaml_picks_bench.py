@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: YamlPicks reason strings, old row loop vs column-wise.
+Run from app/:  python -m benchmarks.yaml_picks_bench [rows]
+"""
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from core.yaml_picks import YamlPicks
+
+# broad filter so most rows become picks
+FILTERS = {
+    "price_ceiling": 1000.0,
+    "rsi_threshold": 100,
+    "volume_multiplier": 0.1,
+    "market_cap_ceiling": 1e12,
+    "float_ceiling": 1e10,
+    "only_positive_macd": False,
+    "pct_min": -50,
+    "pe_max": 999,
+}
+
+def fake_snapshot(n, seed=0):
+    rng = np.random.default_rng(seed)
+    def col(scale, nan_frac=0.1):
+        v = rng.random(n) * scale
+        v[rng.random(n) < nan_frac] = np.nan
+        return v
+    return pd.DataFrame({
+        "Ticker":     [f"T{i}" for i in range(n)],
+        "Price":      col(500, 0),
+        "RSI":        col(100, 0),
+        "MACD":       col(2, 0) - 1,
+        "Volume":     np.round(col(1e6, 0)),
+        "Avg Vol":    col(1e6, 0),
+        "Market Cap": col(1e11, 0),
+        "Float":      col(1e9, 0.3),
+        "PE Ratio":   col(100),
+        "EPS":        col(20) - 10,
+        "Pct Change": col(40, 0) - 10,
+    })
+
+def reasons_iterrows(filters, df_picks):
+    """The previous implementation, kept as the reference."""
+    price_ceiling = float(filters["price_ceiling"])
+    rsi_threshold = float(filters["rsi_threshold"])
+    volume_multiplier = float(filters["volume_multiplier"])
+    market_cap_ceiling = float(filters["market_cap_ceiling"])
+    float_ceiling = float(filters.get("float_ceiling", 0))
+    macd_enabled = filters.get("only_positive_macd", False)
+    min_pct_change = filters.get("pct_min", None)
+    max_pe_ratio = filters.get("pe_max", None)
+    result = {}
+    for _, row in df_picks.iterrows():
+        reasons = []
+        if row["Price"] <= price_ceiling:
+            reasons.append(f"Price {row['Price']:.2f}≤{price_ceiling}")
+        if row["RSI"] <= rsi_threshold:
+            reasons.append(f"RSI {row['RSI']:.1f}≤{rsi_threshold}")
+        if row["Volume"] > volume_multiplier * row["Avg Vol"]:
+            reasons.append("Vol spike")
+        if row["Market Cap"] <= market_cap_ceiling:
+            reasons.append(f"MCap≤{market_cap_ceiling:,}")
+        if pd.notna(row["Float"]) and row["Float"] <= float_ceiling:
+            reasons.append(f"Float≤{float_ceiling:,}")
+        if macd_enabled and row["MACD"] > 0:
+            reasons.append("MACD+")
+        if min_pct_change is not None and row["Pct Change"] >= min_pct_change:
+            reasons.append(f"Pct+{row['Pct Change']:.1f}")
+        if max_pe_ratio is not None and (pd.isna(row["PE Ratio"]) or row["PE Ratio"] <= max_pe_ratio):
+            reasons.append(f"PE≤{max_pe_ratio}")
+        result[row["Ticker"]] = "; ".join(reasons)
+    return result
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    df = fake_snapshot(n)
+    picks = YamlPicks(FILTERS, df).get()
+    df_picks = df[df["Ticker"].isin(picks)]
+    assert reasons_iterrows(FILTERS, df_picks) == picks, "outputs differ"
+
+    runs = 5
+    old = timeit.timeit(lambda: reasons_iterrows(FILTERS, df_picks), number=runs) / runs
+    new = timeit.timeit(lambda: YamlPicks(FILTERS, df).get(), number=runs) / runs
+    print(f"{len(picks)} picks of {n} rows")
+    print(f"iterrows reasons:    {old * 1000:8.2f} ms")
+    print(f"column-wise get():   {new * 1000:8.2f} ms  (mask + reasons)")
+    print(f"speedup:             {old / new:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Batch job: joins stored headlines (data/news.db), scored with the configured FinBERT
+backend, with daily bars into data/data.csv, one row per ticker and news day:
+
+  id;stock;news_dt;check_day;open;close;high;low;volume;change;
+  sentiment_summary_avg;sentiment_summary_med;sentiment_title_avg;sentiment_title_med
+
+check_day is the first trading day the news could move (news after 16:00 counts for the
+next session), change is that day's % change vs the previous close, and sentiment is
+signed (+score positive, -score negative, 0 neutral).
+
+Tickers are processed in chunks and each chunk is appended as soon as it's done, so
+memory stays bounded. Bars for the next chunk download in a thread pool while the
+current chunk's headlines are scored. Re-running resumes from the last ticker written
+(its rows are redone, in case the previous run stopped partway through them).
+
+Run: python build_dataset.py [watchlist.txt ...] [--chunk 25] [--workers 8]
+(default universe: all watchlists; history depth = whatever news_daemon.py has stored)
+"""
+import os
+import sys
+import concurrent.futures
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import yaml
+from core import sentiment
+from core.newsstore import headlines_for
+from core.sentiment import score_headlines
+from precompute import load_tickers
+
+OUT = "data/data.csv"
+SEP = ";"
+COLUMNS = ["id", "stock", "news_dt", "check_day", "open", "close", "high", "low", "volume", "change",
+           "sentiment_summary_avg", "sentiment_summary_med", "sentiment_title_avg", "sentiment_title_med"]
+CLOSE_HOUR = 16
+
+def resume_point(path=OUT):
+    """
+    (last id kept, first stock to redo). A run can stop halfway through a chunk's write, so
+    the last ticker in the file may be incomplete: its rows (and any half-written line) are
+    dropped and that ticker is built again.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        with open(path, "w", newline="") as f:
+            f.write(SEP.join(COLUMNS) + "\n")
+        return -1, None
+
+    with open(path, "rb+") as f:
+        header = f.readline()
+        size = f.seek(0, os.SEEK_END)
+        if not header.endswith(b"\n"):
+            # just the header (as shipped, without a trailing newline)
+            f.write(b"\n")
+            return -1, None
+
+        # read back from the end until the tail holds a row of another stock (or the header)
+        body, pos, tail = len(header), size, b""
+        while True:
+            step = min(1 << 16, pos - body)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.split(b"\n")[:-1]  # the last piece is empty or a half-written row
+            offset = pos
+            if pos > body:
+                offset += len(lines[0]) + 1
+                lines = lines[1:]  # may start mid-line
+            rows = []  # (byte offset, fields) per complete row
+            for l in lines:
+                rows.append((offset, l.decode("utf-8").split(SEP)))
+                offset += len(l) + 1
+            if not rows:
+                if pos > body:
+                    continue
+                f.truncate(body)
+                return -1, None
+            last_stock = rows[-1][1][1]
+            others = [i for i, (_, r) in enumerate(rows) if r[1] != last_stock]
+            if others or pos == body:
+                cut = rows[others[-1] + 1][0] if others else body
+                last_id = int(rows[others[-1]][1][0]) if others else -1
+                f.truncate(cut)
+                return last_id, last_stock
+
+def fetch_bars(ticker, start):
+    import yfinance as yf
+    try:
+        h = yf.Ticker(ticker).history(start=start, interval="1d", auto_adjust=True)
+        return ticker, h.dropna(subset=["Close"])
+    except Exception as e:
+        print(f"[Dataset] {ticker}: no bars ({e})")
+        return ticker, pd.DataFrame()
+
+def signed(label, score):
+    if score is None or label is None:
+        return np.nan
+    label = label.lower()
+    return score if label == "positive" else -score if label == "negative" else 0.0
+
+def chunk_rows(tickers, news, bars):
+    """Dataset rows (without id) for one chunk of tickers."""
+    if news.empty:
+        return []
+    # titles and summaries in one batched pass; scores come from the sentiment cache for the
+    # configured model/backend, not the label stored at ingest (which may be another backend's)
+    titles = news["title"].fillna("").tolist()
+    summaries = news["summary"].fillna("").tolist()
+    has = [i for i, s in enumerate(summaries) if s.strip()]
+    scored = score_headlines(titles + [summaries[i] for i in has])
+    news["title_score"] = [signed(s["label"], s["score"]) for s in scored[:len(titles)]]
+    news["summary_score"] = np.nan
+    if has:
+        news.loc[news.index[has], "summary_score"] = [signed(s["label"], s["score"]) for s in scored[len(titles):]]
+
+    rows = []
+    for tkr in tickers:
+        h, n = bars.get(tkr), news[news["ticker"] == tkr]
+        if h is None or h.empty or n.empty:
+            continue
+        days = np.array(h.index.date)
+        prev_close = h["Close"].shift(1).to_numpy()
+        # news after the close can only move the next session
+        effective = n["ts"].dt.normalize() + pd.to_timedelta((n["ts"].dt.hour >= CLOSE_HOUR).astype(int), unit="D")
+        pos = np.searchsorted(days, effective.dt.date.to_numpy())
+        n = n.assign(pos=pos, news_dt=n["ts"].dt.date)
+        n = n[n["pos"] < len(days)]  # that session hasn't happened yet
+        for (news_dt, p), g in n.groupby(["news_dt", "pos"], sort=True):
+            bar = h.iloc[p]
+            change = (bar["Close"] / prev_close[p] - 1) * 100 if p > 0 else np.nan
+            rows.append([
+                tkr, news_dt, days[p],
+                bar["Open"], bar["Close"], bar["High"], bar["Low"], int(bar["Volume"]), change,
+                g["summary_score"].mean(), g["summary_score"].median(),
+                g["title_score"].mean(), g["title_score"].median(),
+            ])
+    return rows
+
+def load_news(tickers):
+    news = pd.DataFrame(headlines_for(tickers), columns=["ticker", "published", "title", "summary", "label", "score"])
+    news = news.drop(columns=["label", "score"])
+    # AlphaVantage timestamps, treated as US/Eastern
+    news["ts"] = pd.to_datetime(news["published"], format="%Y%m%dT%H%M%S", errors="coerce")
+    return news.dropna(subset=["ts"]).reset_index(drop=True)
+
+def write_rows(rows, next_id, path=OUT):
+    def fmt(v):
+        if isinstance(v, float):
+            return "" if np.isnan(v) else f"{v:.4f}"
+        return str(v)
+    with open(path, "a", newline="") as f:
+        # one write per chunk, tickers in order: an interruption can only cut the last ticker short
+        f.write("".join(SEP.join(fmt(v) for v in [next_id + i, *r]) + "\n" for i, r in enumerate(rows)))
+    return next_id + len(rows)
+
+def main():
+    args = sys.argv[1:]
+    opt = lambda name, default: int(args[args.index(name) + 1]) if name in args else default
+    chunk_size, workers = opt("--chunk", 25), opt("--workers", 8)
+    paths = [a for i, a in enumerate(args) if not a.startswith("--") and (i == 0 or not args[i - 1].startswith("--"))]
+
+    with open("config.yaml", "r") as f:
+        sentiment.configure((yaml.safe_load(f) or {}).get("sentiment"))
+
+    last_id, redo = resume_point()
+    tickers = [t for t in load_tickers(paths) if redo is None or t >= redo]
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    print(f"[Dataset] {len(tickers)} tickers to go in {len(chunks)} chunks, resuming after id {last_id}")
+
+    next_id = last_id + 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        def submit(chunk):
+            news = load_news(chunk)
+            if news.empty:
+                return news, []
+            start = str(news["ts"].min().date() - timedelta(days=7))
+            wanted = sorted(set(news["ticker"]))
+            return news, [pool.submit(fetch_bars, t, start) for t in wanted]
+
+        pending = submit(chunks[0]) if chunks else None
+        for i, chunk in enumerate(chunks):
+            news, futures = pending
+            # queue the next chunk's downloads before scoring this one
+            pending = submit(chunks[i + 1]) if i + 1 < len(chunks) else None
+            bars = dict(f.result() for f in futures)
+            rows = chunk_rows(chunk, news, bars)
+            next_id = write_rows(rows, next_id)
+            print(f"[Dataset] chunk {i + 1}/{len(chunks)} ({chunk[0]}..{chunk[-1]}): {len(rows)} rows")
+
+    print(f"[Dataset] Done, {next_id} rows in {OUT}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import requests
+
+URL = "https://www.alphavantage.co/query"
+
+def fetch_news_feed(api_key, tickers=None, limit=50, sort="LATEST"):
+    """
+    One NEWS_SENTIMENT call. Returns (articles, error).
+    Note: tickers="A,B" means articles mentioning A *and* B, so a market-wide feed
+    (tickers=None) is the only way to cover many tickers in one request.
+    """
+    params = {"function": "NEWS_SENTIMENT", "sort": sort, "limit": limit, "apikey": api_key}
+    if tickers:
+        params["tickers"] = ",".join(tickers) if not isinstance(tickers, str) else tickers
+    r = requests.get(URL, params=params, timeout=30)
+    r.raise_for_status()
+    data = r.json()
+    if "feed" not in data:
+        # quota / bad key / bad ticker all come back as a 200 with a message instead of a feed
+        return [], data.get("Information") or data.get("Note") or data.get("Error Message") or "no feed"
+
+    articles = []
+    for a in data["feed"]:
+        if not a.get("url"):
+            continue
+        articles.append({
+            "url": a["url"],
+            "title": a.get("title", "No title"),
+            "summary": a.get("summary"),
+            "source": a.get("source"),
+            "published": a.get("time_published"),  # '20250717T190000'
+            "tickers": {
+                ts["ticker"]: float(ts.get("relevance_score") or 0)
+                for ts in a.get("ticker_sentiment", []) if ts.get("ticker")
+            },
+        })
+    return articles, None
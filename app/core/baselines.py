@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import time
+
+# Per-ticker seed states + slow-moving info, precomputed once a day by precompute.py
+BASELINES_DB = "data/baselines.db"
+
+STATE_COLS = ["asof", "n", "close", "emaup", "emadn", "ema_fast", "ema_slow", "signal", "macd_n", "vol_sum", "vol_n"]
+INFO_COLS = {
+    "shares_out":   "sharesOutstanding",
+    "market_cap":   "marketCap",
+    "float_shares": "floatShares",
+    "pe":           "trailingPE",
+    "eps":          "trailingEps",
+}
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS baselines (
+            ticker TEXT PRIMARY KEY,
+            asof TEXT, n INTEGER, close REAL, emaup REAL, emadn REAL,
+            ema_fast REAL, ema_slow REAL, signal REAL, macd_n INTEGER,
+            vol_sum REAL, vol_n INTEGER,
+            {", ".join(f"{c} REAL" for c in INFO_COLS)},
+            updated REAL
+        )
+    """)
+    return con
+
+def _num(v):
+    # yfinance info sometimes has strings like "Infinity" where a number belongs
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def save_baselines(states: dict, info_map: dict, path=BASELINES_DB):
+    cols = ["ticker", *STATE_COLS, *INFO_COLS, "updated"]
+    now = time.time()
+    rows = [
+        (
+            tkr,
+            *(state[c] for c in STATE_COLS),
+            *(_num(info_map.get(tkr, {}).get(k)) for k in INFO_COLS.values()),
+            now,
+        )
+        for tkr, state in states.items()
+    ]
+    con = _connect(path)
+    with con:
+        con.executemany(
+            f"INSERT OR REPLACE INTO baselines ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+            rows,
+        )
+    con.close()
+    return len(rows)
+
+def load_baselines(tickers: list[str], path=BASELINES_DB):
+    """Returns (states, info_map) for the tickers that have a baseline row."""
+    if not os.path.exists(path):
+        return {}, {}
+    con = _connect(path)
+    cur = con.execute(
+        f"SELECT ticker, {', '.join(STATE_COLS)}, {', '.join(INFO_COLS)} FROM baselines "
+        f"WHERE ticker IN ({', '.join('?' * len(tickers))})",
+        list(tickers),
+    )
+    states, info_map = {}, {}
+    for row in cur:
+        tkr = row[0]
+        states[tkr] = dict(zip(STATE_COLS, row[1:1 + len(STATE_COLS)]))
+        info = zip(INFO_COLS.values(), row[1 + len(STATE_COLS):])
+        info_map[tkr] = {k: v for k, v in info if v is not None}
+    con.close()
+    return states, info_map
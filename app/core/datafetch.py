@@ -1,7 +1,12 @@
-import yfinance as yf
+import pandas as pd
+import pytz
+import os
+import concurrent.futures
+from datetime import datetime, time
 
 def fetch_batch_history(tickers: list[str], period="3mo", interval="1d"):
     """Use yf.download to get batch historical data"""
+    import yfinance as yf  # lazy, keeps it out of the UI startup imports (benchmarks/startup_bench.py)
     return yf.download(
         tickers=tickers,
         period=period,
@@ -11,3 +16,65 @@ def fetch_batch_history(tickers: list[str], period="3mo", interval="1d"):
         auto_adjust=True,
         progress=False,
     )
+
+def fetch_infos_parallel(tickers):
+    import yfinance as yf
+    def fetch_info(tkr):
+        try:
+            return tkr, yf.Ticker(tkr).info
+        except Exception as e:
+            print(f"[INFO FAIL] {tkr}: {e}")
+            return tkr, {}
+    info_map = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        for tkr, info in executor.map(fetch_info, tickers):
+            info_map[tkr] = info
+    return info_map
+
+def fetch_batch_quotes(tickers: list[str]) -> dict:
+    """
+    Latest price + cumulative volume for every ticker, from today's daily bar in one
+    batched request (a few KB instead of months of history).
+    Returns {ticker: {"date", "Price", "Volume"}}.
+    """
+    df = fetch_batch_history(tickers, period="1d", interval="1d")
+    quotes = {}
+    for tkr in tickers:
+        try:
+            q = df.get(tkr) if isinstance(df.columns, pd.MultiIndex) else df
+            q = q.dropna(subset=["Close"]) if q is not None else None
+            if q is None or q.empty:
+                continue
+            last = q.iloc[-1]
+            quotes[tkr] = {
+                "date":   str(q.index[-1].date()),
+                "Price":  float(last["Close"]),
+                "Volume": float(last["Volume"]),
+            }
+        except Exception as e:
+            print(f"[QUOTE FAIL] {tkr}: {e}")
+    return quotes
+
+def is_market_open():
+    now = datetime.now(pytz.timezone("US/Eastern"))
+    return now.weekday() < 5 and time(9, 30) <= now.time() <= time(16, 0)
+
+def is_extended_hours():
+    """Pre-market (4:00-9:30) or after-hours (16:00-20:00) on a weekday."""
+    now = datetime.now(pytz.timezone("US/Eastern"))
+    return now.weekday() < 5 and time(4, 0) <= now.time() <= time(20, 0) and not is_market_open()
+
+def load_all_tickers(watchlists_dir="watchlists"):
+    """Every ticker across all watchlist .txt files."""
+    tickers = set()
+    for fname in os.listdir(watchlists_dir):
+        if fname.endswith(".txt"):
+            with open(os.path.join(watchlists_dir, fname)) as f:
+                for line in f:
+                    t = line.split("#")[0].strip().upper()
+                    if t:
+                        tickers.add(t)
+    tickers = sorted(tickers)
+    if not tickers:
+        raise ValueError("No tickers found in watchlists.")
+    return tickers
@@ -0,0 +1,72 @@
+import math
+import pandas as pd
+
+# Same windows/smoothing as ta's RSIIndicator(14) and MACD(26, 12, 9), so a snapshot built
+# from a seed state matches one built by running ta over the full history.
+RSI_WINDOW = 14
+MACD_SLOW, MACD_FAST, MACD_SIGN = 26, 12, 9
+AVG_VOL_WINDOW = 20
+
+def _alpha(span):
+    return 2 / (span + 1)
+
+def seed_state(h: pd.DataFrame) -> dict:
+    """
+    Indicator state as of the last bar of h (completed daily bars, oldest first).
+    Enough to compute every snapshot indicator for the next bar in O(1).
+    """
+    close = h["Close"]
+    diff = close.diff()
+    up = diff.where(diff > 0, 0.0)
+    dn = -diff.where(diff < 0, 0.0)
+
+    fast = close.ewm(span=MACD_FAST, adjust=False).mean()
+    slow = close.ewm(span=MACD_SLOW, adjust=False).mean()
+    macd = (fast - slow).iloc[MACD_SLOW - 1:]
+    vol = h["Volume"].iloc[-(AVG_VOL_WINDOW - 1):]
+
+    return {
+        "asof":      str(h.index[-1].date()),
+        "n":         len(h),
+        "close":     float(close.iloc[-1]),
+        "emaup":     float(up.ewm(alpha=1 / RSI_WINDOW, adjust=False).mean().iloc[-1]),
+        "emadn":     float(dn.ewm(alpha=1 / RSI_WINDOW, adjust=False).mean().iloc[-1]),
+        "ema_fast":  float(fast.iloc[-1]),
+        "ema_slow":  float(slow.iloc[-1]),
+        "signal":    float(macd.ewm(span=MACD_SIGN, adjust=False).mean().iloc[-1]) if len(macd) else None,
+        "macd_n":    len(macd),
+        "vol_sum":   float(vol.sum()),
+        "vol_n":     len(vol),
+    }
+
+def last_bar(state: dict, close: float, volume: float) -> dict:
+    """RSI, MACD diff, average volume and % change for a live bar on top of a seed state."""
+    n = state["n"] + 1
+    diff = close - state["close"]
+
+    a = 1 / RSI_WINDOW
+    emaup = (1 - a) * state["emaup"] + a * max(diff, 0.0)
+    emadn = (1 - a) * state["emadn"] + a * max(-diff, 0.0)
+    if n < RSI_WINDOW:
+        rsi = math.nan
+    else:
+        rsi = 100.0 if emadn == 0 else 100 - 100 / (1 + emaup / emadn)
+
+    fast = (1 - _alpha(MACD_FAST)) * state["ema_fast"] + _alpha(MACD_FAST) * close
+    slow = (1 - _alpha(MACD_SLOW)) * state["ema_slow"] + _alpha(MACD_SLOW) * close
+    macd_diff = math.nan
+    if n >= MACD_SLOW:
+        macd = fast - slow
+        if state["signal"] is None:
+            signal = macd
+        else:
+            signal = (1 - _alpha(MACD_SIGN)) * state["signal"] + _alpha(MACD_SIGN) * macd
+        if state["macd_n"] + 1 >= MACD_SIGN:
+            macd_diff = macd - signal
+
+    return {
+        "RSI":        rsi,
+        "MACD":       macd_diff,
+        "Avg Vol":    (state["vol_sum"] + volume) / (state["vol_n"] + 1),
+        "Pct Change": (close / state["close"] - 1) * 100,
+    }
@@ -1,43 +1,56 @@
+import time
 import streamlit as st
-import requests
-from transformers import pipeline
 from datetime import datetime
+from core.singleflight import single_flight
+from core.sentiment import score_headlines
+from core.alphavantage import fetch_news_feed
+from core.newsstore import save_articles, recent_news, mark_ingested, ingested_at
 
-@st.cache_resource
-def get_sentiment_analyzer():
-    return pipeline("sentiment-analysis", model="ProsusAI/finbert")
+NEWS_TTL = 600  # seconds before a ticker's headlines are fetched live again
 
-@st.cache_data(ttl=600)
+def ticker_news(ticker, limit, alpha_api=None):
+    """
+    Stored headlines for a ticker. If nothing fetched its feed in the last NEWS_TTL
+    (news_daemon.py is optional), a live fetch tops the store up first.
+    """
+    if alpha_api and time.time() - ingested_at(ticker) > NEWS_TTL:
+        get_news(ticker, limit, alpha_api=alpha_api)  # saves into the store
+    return recent_news(ticker, limit=limit)
+
+@st.cache_data(ttl=NEWS_TTL)
+@single_flight
 def get_news(ticker, limit, alpha_api="YOUR_KEY_HERE"):
-    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&apikey={alpha_api}"
-    r = requests.get(url)
-    data = r.json()
+    """Live AlphaVantage headlines for one ticker, also saved into the news store."""
+    articles, error = fetch_news_feed(alpha_api, tickers=ticker, limit=max(limit, 50))
+    if error:
+        print(f"[News] {ticker}: {error}")
+    else:
+        mark_ingested(ticker)
+    articles = articles[:limit]
 
-    sentiment_analyzer = get_sentiment_analyzer()
-    news = []
+    # one batched pass over the headlines we haven't scored before (any ticker, any refresh)
+    for a, sentiment in zip(articles, score_headlines([a["title"] for a in articles])):
+        a["label"] = sentiment["label"]
+        a["score"] = sentiment["score"]
+    if articles:
+        save_articles(articles)
 
-    feed = data.get("feed", [])[:limit]
-    for article in feed:
-        title = article.get("title", "No title")
-        link = article.get("url", "#")
-        time_published = article.get("time_published")  # Format: '20250717T190000'
-        
+    news = []
+    for a in articles:
         # Parse timestamp to readable format
         timestamp = None
-        if time_published:
+        if a["published"]:
             try:
-                dt = datetime.strptime(time_published, "%Y%m%dT%H%M%S")
+                dt = datetime.strptime(a["published"], "%Y%m%dT%H%M%S")
                 timestamp = dt.strftime("%b %d, %Y %I:%M %p")
             except:
                 timestamp = "Unknown"
 
-        sentiment = sentiment_analyzer(title)[0]
-
         news.append({
-            "title": title,
-            "url": link,
-            "sentiment": sentiment["label"],
-            "confidence": round(sentiment["score"], 3),
+            "title": a["title"],
+            "url": a["url"],
+            "sentiment": a["label"],
+            "confidence": round(a["score"], 3),
             "timestamp": timestamp
         })
 
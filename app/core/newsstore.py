@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+# Headlines + sentiment for every ticker, filled by news_daemon.py (and by live fetches in the UI)
+NEWS_DB = "data/news.db"
+
+def _connect(path=NEWS_DB):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")  # the daemon writes while the UI reads
+    con.executescript("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            url TEXT UNIQUE,
+            title TEXT, summary TEXT, source TEXT,
+            published TEXT,
+            label TEXT, score REAL,
+            fetched REAL
+        );
+        CREATE TABLE IF NOT EXISTS article_tickers (
+            article_id INTEGER, ticker TEXT, relevance REAL,
+            PRIMARY KEY (article_id, ticker)
+        );
+        CREATE INDEX IF NOT EXISTS article_tickers_ticker ON article_tickers (ticker);
+        CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, content='articles', content_rowid='id'
+        );
+        CREATE TABLE IF NOT EXISTS ingest_state (key TEXT PRIMARY KEY, value TEXT);
+    """)
+    return con
+
+def save_articles(articles: list[dict], path=NEWS_DB) -> int:
+    """
+    Insert articles ({"url", "title", "summary", "source", "published", "label", "score",
+    "tickers": {ticker: relevance}}). Known URLs only get new ticker tags. Returns # new.
+    """
+    con = _connect(path)
+    new = 0
+    now = time.time()
+    with con:
+        for a in articles:
+            cur = con.execute(
+                "INSERT OR IGNORE INTO articles (url, title, summary, source, published, label, score, fetched) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (a["url"], a["title"], a.get("summary"), a.get("source"), a.get("published"),
+                 a.get("label"), a.get("score"), now),
+            )
+            if cur.rowcount:
+                new += 1
+                aid = cur.lastrowid
+                con.execute("INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)",
+                            (aid, a["title"], a.get("summary") or ""))
+            else:
+                aid = con.execute("SELECT id FROM articles WHERE url = ?", (a["url"],)).fetchone()[0]
+            con.executemany(
+                "INSERT OR REPLACE INTO article_tickers (article_id, ticker, relevance) VALUES (?, ?, ?)",
+                [(aid, t, r) for t, r in (a.get("tickers") or {}).items()],
+            )
+    con.close()
+    return new
+
+def known_urls(urls, path=NEWS_DB) -> set:
+    con = _connect(path)
+    urls = list(urls)
+    found = set()
+    for i in range(0, len(urls), 500):
+        chunk = urls[i:i + 500]
+        found.update(r[0] for r in con.execute(
+            f"SELECT url FROM articles WHERE url IN ({', '.join('?' * len(chunk))})", chunk))
+    con.close()
+    return found
+
+def _items(rows):
+    """Rows -> the dicts the news panel renders."""
+    items = []
+    for title, url, published, label, score, source in rows:
+        try:
+            timestamp = datetime.strptime(published, "%Y%m%dT%H%M%S").strftime("%b %d, %Y %I:%M %p")
+        except (TypeError, ValueError):
+            timestamp = "Unknown"
+        items.append({
+            "title": title,
+            "url": url,
+            "timestamp": timestamp,
+            "sentiment": label or "neutral",
+            "confidence": round(score, 3) if score is not None else 0.0,
+            "source": source,
+        })
+    return items
+
+def recent_news(ticker: str, limit=5, path=NEWS_DB) -> list[dict]:
+    """Latest stored headlines for a ticker (newest first)."""
+    if not os.path.exists(path):
+        return []
+    con = _connect(path)
+    rows = con.execute(
+        "SELECT a.title, a.url, a.published, a.label, a.score, a.source FROM articles a "
+        "JOIN article_tickers t ON t.article_id = a.id "
+        "WHERE t.ticker = ? ORDER BY a.published DESC LIMIT ?",
+        (ticker, limit),
+    ).fetchall()
+    con.close()
+    return _items(rows)
+
+def search_news(query: str, limit=20, path=NEWS_DB) -> list[dict]:
+    """Full-text search over titles and summaries of every stored headline, best match first."""
+    if not query.strip() or not os.path.exists(path):
+        return []
+    # each word quoted (user input can't break the FTS syntax) and prefix-matched ("earn" finds "earnings")
+    words = [w.strip('"*').replace('"', '""') for w in query.split()]
+    match = " ".join(f'"{w}"*' for w in words if w)
+    if not match:
+        return []
+    con = _connect(path)
+    rows = con.execute(
+        "SELECT a.title, a.url, a.published, a.label, a.score, a.source FROM articles_fts f "
+        "JOIN articles a ON a.id = f.rowid "
+        "WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts), a.published DESC LIMIT ?",
+        (match, limit),
+    ).fetchall()
+    con.close()
+    return _items(rows)
+
+def get_state(key, default=None, path=NEWS_DB):
+    con = _connect(path)
+    row = con.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+    con.close()
+    return row[0] if row else default
+
+def set_state(key, value, path=NEWS_DB):
+    con = _connect(path)
+    with con:
+        con.execute("INSERT OR REPLACE INTO ingest_state (key, value) VALUES (?, ?)", (key, str(value)))
+    con.close()
+
+def mark_ingested(ticker, path=NEWS_DB):
+    """Record that ticker's own feed was just fetched (by the UI or news_daemon.py)."""
+    set_state(f"ingested:{ticker}", time.time(), path)
+
+def ingested_at(ticker, path=NEWS_DB) -> float:
+    if not os.path.exists(path):
+        return 0.0
+    return float(get_state(f"ingested:{ticker}", 0, path))
+
+def headlines_for(tickers, path=NEWS_DB):
+    """Every stored (ticker, published, title, summary, label, score) for these tickers, by ticker and time."""
+    tickers = list(tickers)
+    if not tickers or not os.path.exists(path):
+        return []
+    con = _connect(path)
+    rows = con.execute(
+        "SELECT t.ticker, a.published, a.title, a.summary, a.label, a.score FROM article_tickers t "
+        f"JOIN articles a ON a.id = t.article_id WHERE t.ticker IN ({', '.join('?' * len(tickers))}) "
+        "ORDER BY t.ticker, a.published",
+        tickers,
+    ).fetchall()
+    con.close()
+    return rows
@@ -0,0 +1,150 @@
+import time
+import requests
+import pandas as pd
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta
+import pytz
+from core.ratelimit import upstream
+
+MAX_TICKERS_PARAM = 250  # past this, one whole-market snapshot is cheaper than a huge query string
+TODAY_TTL = 900  # today's grouped bar only shows up after the close; don't ask for it every refresh
+
+class PolygonBulk:
+    """
+    Whole-market quotes from Polygon in one or two requests instead of one per ticker.
+    Uses the all-tickers snapshot (includes pre-market / after-hours trades) and falls
+    back to grouped daily bars if the plan doesn't include snapshots (remembered, so the
+    snapshot isn't asked again). Every request draws from the shared Polygon rate budget.
+    base_url is configurable so it can be pointed at a local stand-in.
+    """
+    def __init__(self, api_key, base_url="https://api.polygon.io", timeout=15):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=2))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=2))
+        self.has_snapshot = True  # False after a 401/403: the plan doesn't include it
+        self.grouped = {}  # date -> ({ticker: bar}, fetched); finished days don't change
+
+    def _get(self, path, **params):
+        upstream["polygon"].take()
+        r = self.session.get(f"{self.base_url}{path}", params={**params, "apiKey": self.api_key}, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def snapshot(self, tickers=None) -> list[dict]:
+        """Raw snapshot rows for tickers (or the whole market)."""
+        params = {}
+        if tickers and len(tickers) <= MAX_TICKERS_PARAM:
+            params["tickers"] = ",".join(tickers)
+        return self._get("/v2/snapshot/locale/us/markets/stocks/tickers", **params).get("tickers", [])
+
+    def grouped_daily(self, date: str) -> list[dict]:
+        """One daily bar per US stock for date (YYYY-MM-DD)."""
+        return self._get(f"/v2/aggs/grouped/locale/us/market/stocks/{date}", adjusted="true").get("results", [])
+
+    def quotes(self, tickers: list[str]) -> dict:
+        """
+        Latest price, volume and % change vs the previous close for every ticker.
+        Returns {ticker: {"date", "Price", "Volume", "Pct Change"}}.
+        """
+        wanted = set(tickers)
+        if self.has_snapshot:
+            try:
+                rows = self.snapshot(tickers)
+                return {r["ticker"]: q for r in rows if r.get("ticker") in wanted and (q := _from_snapshot(r))}
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in (401, 403):
+                    raise
+                self.has_snapshot = False
+                print(f"[PolygonBulk] Snapshot not available ({e.response.status_code}), using grouped daily from now on")
+        return self._grouped_quotes(wanted)
+
+    def _grouped_day(self, day):
+        """{ticker: bar} for one date; finished days are kept, today for TODAY_TTL."""
+        date = str(day)
+        today = day >= datetime.now(pytz.timezone("US/Eastern")).date()
+        if date in self.grouped:
+            bars, fetched = self.grouped[date]
+            if not today or time.time() - fetched < TODAY_TTL:
+                return bars
+        bars = {r["T"]: r for r in self.grouped_daily(date) if r.get("T")}
+        self.grouped[date] = (bars, time.time())
+        for old in [d for d in self.grouped if d < str(day - timedelta(days=10))]:
+            del self.grouped[old]
+        return bars
+
+    def _grouped_quotes(self, wanted):
+        # latest trading day with data, and the one before it for the % change
+        day = datetime.now(pytz.timezone("US/Eastern")).date()
+        bars = []
+        for _ in range(7):
+            rows = self._grouped_day(day)
+            if rows:
+                bars.append((str(day), {t: r for t, r in rows.items() if t in wanted}))
+                if len(bars) == 2:
+                    break
+            day -= timedelta(days=1)
+        if not bars:
+            return {}
+
+        date, last = bars[0]
+        prev = bars[1][1] if len(bars) > 1 else {}
+        quotes = {}
+        for t, r in last.items():
+            pc = prev.get(t, {}).get("c")
+            quotes[t] = {
+                "date": date,
+                "Price": float(r["c"]),
+                "Volume": float(r.get("v", 0)),
+                "Pct Change": (r["c"] - pc) / pc * 100 if pc else None,
+            }
+        return quotes
+
+def _from_snapshot(r):
+    last = (r.get("lastTrade") or {}).get("p") or (r.get("min") or {}).get("c") or (r.get("day") or {}).get("c")
+    if not last:
+        return None
+    # min.av = accumulated volume for the day, extended hours included
+    vol = (r.get("min") or {}).get("av") or (r.get("day") or {}).get("v") or 0
+    prev = (r.get("prevDay") or {}).get("c")
+    updated = r.get("updated") or (r.get("lastTrade") or {}).get("t")
+    date = None
+    if updated:
+        ts = pd.Timestamp(int(updated), unit="ns" if updated > 1e15 else "ms", tz="UTC")
+        date = str(ts.tz_convert("US/Eastern").date())
+    return {
+        "date": date,
+        "Price": float(last),
+        "Volume": float(vol),
+        "Pct Change": (last - prev) / prev * 100 if prev else r.get("todaysChangePerc"),
+    }
+
+def patch_quotes(df: pd.DataFrame, quotes: dict) -> pd.DataFrame:
+    """Snapshot rows with Price / Volume / Pct Change replaced by bulk quotes where we have one."""
+    if df.empty or not quotes:
+        return df
+    df = df.copy()
+    rows = df["Ticker"].map(quotes)
+    has = rows.notna()
+    for col in ("Price", "Volume", "Pct Change"):
+        vals = rows[has].map(lambda q: q.get(col))
+        ok = vals.notna()
+        df[col] = df[col].astype(float)
+        df.loc[vals.index[ok], col] = vals[ok].astype(float)
+    print(f"[PolygonBulk] Patched {int(has.sum())}/{len(df)} tickers with extended-hours quotes")
+    return df
+
+_providers = {}  # (api_key, base_url) -> PolygonBulk, so reruns keep the pooled connection
+
+def bulk_from_config(config: dict):
+    """PolygonBulk from config.yaml (polygon_bulk block + api_keys.polygon), or None if off."""
+    cfg = config.get("polygon_bulk") or {}
+    key = (config.get("api_keys") or {}).get("polygon")
+    if not cfg.get("enabled") or not key or key == "YOUR_API_KEY_HERE":
+        return None
+    base_url = cfg.get("base_url", "https://api.polygon.io")
+    if (key, base_url) not in _providers:
+        _providers[(key, base_url)] = PolygonBulk(key, base_url=base_url)
+    return _providers[(key, base_url)]
@@ -0,0 +1,55 @@
+import operator
+import numpy as np
+import pandas as pd
+
+# filter profile key -> (snapshot column, comparison, NaN passes)
+CLAUSES = {
+    "price_ceiling":      ("Price", operator.le, False),
+    "rsi_threshold":      ("RSI", operator.le, False),
+    "volume_multiplier":  ("Volume/Avg Vol", operator.gt, False),
+    "market_cap_ceiling": ("Market Cap", operator.le, False),
+    "float_ceiling":      ("Float", operator.le, True),
+    "pe_max":             ("PE Ratio", operator.le, True),
+    "eps_min":            ("EPS", operator.ge, True),
+    "pct_min":            ("Pct Change", operator.ge, False),
+}
+
+def _column(df, col):
+    if col == "Volume/Avg Vol":
+        return df["Volume"].to_numpy(dtype=float) / df["Avg Vol"].to_numpy(dtype=float)
+    return np.asarray(df[col].to_numpy(), dtype=float)
+
+def evaluate_profiles(df: pd.DataFrame, profiles: dict, defaults: dict = None) -> pd.DataFrame:
+    """
+    Screen every profile in one vectorized pass.
+    Returns a tickers x profiles boolean frame. Keys a profile doesn't set fall back to
+    defaults (e.g. what the filter sliders show for them), else don't filter.
+    """
+    defaults = defaults or {}
+    names = list(profiles)
+    hits = np.ones((len(df), len(names)), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for key, (col, op, nan_ok) in CLAUSES.items():
+            limits = np.array([
+                float(v) if (v := p.get(key, defaults.get(key))) is not None else np.nan
+                for p in profiles.values()
+            ])
+            if np.isnan(limits).all():
+                continue
+            v = _column(df, col)[:, None]
+            ok = op(v, limits[None, :]) | np.isnan(limits)[None, :]
+            if nan_ok:
+                ok |= np.isnan(v)
+            hits &= ok
+
+        macd_on = np.array([bool(p.get("only_positive_macd", defaults.get("only_positive_macd"))) for p in profiles.values()])
+        if macd_on.any():
+            hits &= (_column(df, "MACD") > 0)[:, None] | ~macd_on[None, :]
+
+    return pd.DataFrame(hits, index=df["Ticker"].to_numpy(), columns=names)
+
+def matching_profiles(matrix: pd.DataFrame) -> np.ndarray:
+    """Per ticker, the comma-joined names of the profiles it matches."""
+    names = matrix.columns.to_numpy()
+    return np.array([", ".join(names[row]) for row in matrix.to_numpy()], dtype=object)
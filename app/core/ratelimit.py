@@ -0,0 +1,51 @@
+import threading
+import time
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, bursts up to `burst`."""
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def set_rate(self, rate, burst=None):
+        """Change the rate in place; tokens already spent stay spent."""
+        with self.lock:
+            self._refill()
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self.tokens = min(self.tokens, burst)
+
+    def take(self):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Request budget per upstream, shared by every fetch in the process (foreground charts
+# and the prefetcher alike). Burst + rate * 60 <= 5, so Polygon's free tier never sees
+# more than 5 calls in a minute.
+upstream = {
+    "yahoo": TokenBucket(2.0, burst=4),
+    "polygon": TokenBucket(3 / 60, burst=2),
+}
+
+def configure(cfg):
+    """rate_limits block from config.yaml ({upstream: requests per second}). Safe to call on every rerun."""
+    for src, r in (cfg or {}).items():
+        if src in upstream:
+            upstream[src].set_rate(float(r))
+        else:
+            upstream[src] = TokenBucket(float(r))
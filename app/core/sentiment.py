@@ -0,0 +1,126 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# FinBERT scores by headline hash and model, so a headline never goes through the model twice
+SENTIMENT_DB = "data/sentiment.db"
+MODEL = "ProsusAI/finbert"
+BATCH_SIZE = 32
+
+BACKENDS = ("torch", "int8", "onnx")
+ONNX_DIR = "data/finbert-onnx"
+
+_lock = threading.Lock()
+_analyzer = None
+_backend = "torch"
+_loaded_backend = None  # what _analyzer actually runs (a missing backend falls back to torch)
+
+def configure(cfg):
+    """sentiment block of config.yaml: backend = torch (default) | int8 | onnx."""
+    global _backend
+    backend = (cfg or {}).get("backend", "torch")
+    if backend not in BACKENDS:
+        print(f"[Sentiment] Unknown backend {backend!r}, using torch")
+        backend = "torch"
+    _backend = backend
+
+def load_pipeline(backend="torch"):
+    """
+    FinBERT text-classification pipeline on the given backend:
+      torch - the full-precision model, as before
+      int8  - same model with its Linear layers dynamically quantized to int8 (CPU)
+      onnx  - exported once to data/finbert-onnx and run with onnxruntime (needs optimum[onnxruntime])
+    """
+    from transformers import pipeline, AutoTokenizer
+    if backend == "torch":
+        return pipeline("sentiment-analysis", model=MODEL)
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL)
+    if backend == "int8":
+        import torch
+        from transformers import AutoModelForSequenceClassification
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL)
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    if os.path.exists(os.path.join(ONNX_DIR, "model.onnx")):
+        model = ORTModelForSequenceClassification.from_pretrained(ONNX_DIR)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(MODEL, export=True)
+        model.save_pretrained(ONNX_DIR)
+        tokenizer.save_pretrained(ONNX_DIR)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+def get_analyzer():
+    """The FinBERT pipeline for the configured backend, loaded once per process on first use."""
+    global _analyzer, _loaded_backend
+    with _lock:
+        if _analyzer is None:
+            t0 = time.time()
+            try:
+                _analyzer, _loaded_backend = load_pipeline(_backend), _backend
+            except ImportError as e:
+                print(f"[Sentiment] {_backend} backend unavailable ({e}), using torch")
+                _analyzer, _loaded_backend = load_pipeline("torch"), "torch"
+            print(f"[Sentiment] Loaded {MODEL} ({_loaded_backend}) in {time.time() - t0:.1f}s")
+        return _analyzer
+
+def model_tag() -> str:
+    """What produced a score: model and backend (int8 / onnx labels can differ from torch)."""
+    return f"{MODEL}/{_loaded_backend or _backend}"
+
+def headline_hash(text: str) -> str:
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path)
+    con.executescript("""
+        -- the first version had no model column; which backend made those rows is unknown
+        DROP TABLE IF EXISTS sentiment;
+        CREATE TABLE IF NOT EXISTS scores (
+            hash TEXT, model TEXT,
+            label TEXT, score REAL,
+            updated REAL,
+            PRIMARY KEY (hash, model)
+        );
+    """)
+    return con
+
+def _cached(con, hashes, model):
+    out = {}
+    hashes = list(hashes)
+    for i in range(0, len(hashes), 500):  # stay under SQLite's parameter limit
+        chunk = hashes[i:i + 500]
+        cur = con.execute(
+            f"SELECT hash, label, score FROM scores WHERE model = ? AND hash IN ({', '.join('?' * len(chunk))})",
+            [model, *chunk],
+        )
+        out.update({h: {"label": label, "score": score} for h, label, score in cur})
+    return out
+
+def score_headlines(texts: list[str], batch_size=BATCH_SIZE, path=SENTIMENT_DB) -> list[dict]:
+    """
+    [{"label", "score"}] per text, in order. Cached scores come from SQLite; only unseen
+    headlines (each once, however often it repeats) go through the model, in batches.
+    """
+    hashes = [headline_hash(t) for t in texts]
+    con = _connect(path)
+    try:
+        scores = _cached(con, set(hashes), model_tag())
+        todo = {h: t for h, t in zip(hashes, texts) if h not in scores}
+        if todo:
+            t0 = time.time()
+            results = get_analyzer()(list(todo.values()), batch_size=batch_size, truncation=True)
+            now, model = time.time(), model_tag()  # after loading: a failed backend falls back to torch
+            rows = [(h, model, r["label"], float(r["score"]), now) for h, r in zip(todo, results)]
+            with con:
+                con.executemany("INSERT OR REPLACE INTO scores (hash, model, label, score, updated) VALUES (?, ?, ?, ?, ?)", rows)
+            scores.update({h: {"label": label, "score": score} for h, _, label, score, _ in rows})
+            print(f"[Sentiment] Scored {len(todo)} new headlines in {time.time() - t0:.2f}s ({len(set(hashes)) - len(todo)} cached)")
+    finally:
+        con.close()
+    return [scores[h] for h in hashes]
@@ -0,0 +1,60 @@
+import threading
+import functools
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Process-wide request coalescing. Concurrent callers with the same key wait for the
+    one in-flight call and share its result (or exception) instead of firing their own.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.counts = {"calls": 0, "coalesced": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            self.counts["calls"] += 1
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                self.counts["coalesced"] += 1
+
+        if not leader:
+            print(f"[SingleFlight] Waiting on in-flight call {str(key)[:80]}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, in_flight=len(self.calls))
+
+flight = SingleFlight()
+
+def single_flight(fn):
+    """Decorator: coalesce concurrent calls to fn with identical arguments."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__module__, fn.__qualname__, repr(args), repr(sorted(kwargs.items())))
+        return flight.do(key, fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,160 @@
+import threading
+import pandas as pd
+from core.datafetch import fetch_batch_history, fetch_infos_parallel, fetch_batch_quotes, is_extended_hours
+from core.indicators import seed_state, last_bar
+from core.baselines import load_baselines
+from core.tiers import RefreshScheduler
+from core.polygon_bulk import patch_quotes
+
+def _days_after(date_str, days):
+    return str((pd.Timestamp(date_str) + pd.Timedelta(days=days)).date())
+
+def split_history(tickers: list[str], hist_all: pd.DataFrame):
+    """
+    Split batch history into a seed state of the completed bars and the live (last) bar.
+    Returns (states, quotes) keyed by ticker.
+    """
+    states, quotes = {}, {}
+    for tkr in tickers:
+        try:
+            h = hist_all.get(tkr) if isinstance(hist_all.columns, pd.MultiIndex) else hist_all
+            h = h.dropna(subset=["Close"]) if h is not None else None
+            if h is None or h.empty or len(h) < 2:
+                print(f"[SKIP] No data for {tkr}")
+                continue
+
+            state = seed_state(h.iloc[:-1])
+            state["live_date"] = str(h.index[-1].date())
+            states[tkr] = state
+            quotes[tkr] = {
+                "date":   state["live_date"],
+                "Price":  float(h["Close"].iloc[-1]),
+                "Volume": float(h["Volume"].iloc[-1]),
+            }
+        except Exception as e:
+            print(f"[ERROR] {tkr}: {e}")
+            continue
+    return states, quotes
+
+def snapshot_from_states(tickers: list[str], states: dict, quotes: dict, info_map: dict) -> pd.DataFrame:
+    """One row per ticker from seed states + live quotes. Only the last bar is computed."""
+    rows = []
+
+    for tkr in tickers:
+        state, quote = states.get(tkr), quotes.get(tkr)
+        if state is None or quote is None:
+            continue
+        try:
+            price = quote["Price"]
+            ind = last_bar(state, price, quote["Volume"])
+
+            info = info_map.get(tkr, {})
+            so = info.get("sharesOutstanding")
+            mcap = so * price if so else info.get("marketCap", 0)
+
+            rows.append({
+                "Ticker":     tkr,
+                "Price":      price,
+                "RSI":        ind["RSI"],
+                "MACD":       ind["MACD"],
+                "Volume":     int(quote["Volume"]),
+                "Avg Vol":    ind["Avg Vol"],
+                "Market Cap": mcap,
+                "Float":      info.get("floatShares", None),
+                "PE Ratio":   info.get("trailingPE", None),
+                "EPS":        info.get("trailingEps", None),
+                "Pct Change": ind["Pct Change"],
+            })
+        except Exception as e:
+            print(f"[ERROR] {tkr}: {e}")
+            continue
+
+    print(f"[DONE] Fetched {len(rows)} tickers.")
+    return pd.DataFrame(rows)
+
+class SnapshotBuilder:
+    """
+    Builds snapshots for the UI and the alerts daemon, so both see the same numbers.
+    Keeps the seed states + infos of the last full load per universe.
+    With fast=True (market hours) builds only fetch the latest quotes and patch them on
+    top of those, or of the nightly baselines table; a full history reload only happens
+    when neither matches the current session.
+    With a bulk provider set (PolygonBulk), pre-market / after-hours prices are patched
+    on top from one whole-market request.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = {}  # tuple(tickers) -> {"states", "quotes", "info"}
+        self.scheduler = RefreshScheduler()
+        self.bulk = None
+
+    def build(self, tickers: list[str], fast=False) -> pd.DataFrame:
+        extended = self.bulk is not None and is_extended_hours()
+        # outside regular hours the daily bars don't move, so reuse the session states
+        df = self._build(tickers, fast or extended)
+        if extended:
+            try:
+                df = patch_quotes(df, self.bulk.quotes(tickers))
+            except Exception as e:
+                print(f"[PolygonBulk] Extended-hours quotes failed: {e}")
+        return df
+
+    def _build(self, tickers, fast):
+        key = tuple(tickers)
+
+        if fast:
+            with self.lock:
+                session = self.sessions.get(key)
+            df = self._quote_refresh(tickers, session) if session else None
+            if df is None:
+                # No session yet, or it rolled over: try last night's precomputed baselines
+                session = self._baseline_session(tickers)
+                df = self._quote_refresh(tickers, session) if session else None
+            if df is not None:
+                with self.lock:
+                    self.sessions[key] = session
+                return df
+
+        hist_all = fetch_batch_history(tickers)
+        info_map = fetch_infos_parallel(tickers)
+        states, quotes = split_history(tickers, hist_all)
+        self.scheduler.mark(quotes)
+        with self.lock:
+            self.sessions[key] = {"states": states, "quotes": quotes, "info": info_map}
+        return snapshot_from_states(tickers, states, quotes, info_map)
+
+    def _baseline_session(self, tickers):
+        states, info_map = load_baselines(tickers)
+        if not states or len(states) < len(set(tickers)):
+            return None
+        for state in states.values():
+            state["live_date"] = None  # the first session after asof, set by the first quote
+        return {"states": states, "quotes": {}, "info": info_map}
+
+    def _quote_refresh(self, tickers, session):
+        states = session["states"]
+        quotes = session["quotes"]
+        # Only tickers whose tier interval elapsed (plus any we have no quote for yet)
+        due = self.scheduler.due(list(states))
+        due += [t for t in states if t not in quotes and t not in due]
+        if not due:
+            return snapshot_from_states(tickers, states, quotes, session["info"])
+        fresh = fetch_batch_quotes(due)
+        if not fresh:
+            return None
+        for t, q in fresh.items():
+            # Baselines only seed the next session (allowing for weekends/holidays)
+            asof = states[t]["asof"]
+            if states[t]["live_date"] is None and asof < q["date"] <= _days_after(asof, 4):
+                states[t]["live_date"] = q["date"]
+        # A quote from a newer day than the bar the states were seeded against = new session
+        if any(states[t]["live_date"] is None or q["date"] > states[t]["live_date"] for t, q in fresh.items()):
+            print("[Snapshot] New session, reloading")
+            return None
+        fresh = {t: q for t, q in fresh.items() if q["date"] == states[t]["live_date"]}
+        self.scheduler.observe(quotes, fresh)
+        self.scheduler.mark(due)
+        quotes.update(fresh)
+        tiers = self.scheduler.counts(states)
+        print(f"[Snapshot] Quote refresh for {len(fresh)}/{len(states)} tickers (tiers: {tiers})")
+        return snapshot_from_states(tickers, states, quotes, session["info"])
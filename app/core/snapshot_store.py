@@ -0,0 +1,83 @@
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+
+# Arrow IPC file the alerts daemon publishes each finished snapshot to
+SNAPSHOT_FILE = "data/snapshot.arrow"
+
+def publish_snapshot(df: pd.DataFrame, universe=None, path=SNAPSHOT_FILE):
+    """
+    Write a snapshot as an Arrow IPC file, tagged with a version, timestamp and the
+    tickers it was built for (so readers can tell "no data" from "not covered").
+    Written to a temp file and swapped in so readers never see a half-written file.
+    """
+    prev = read_meta(path)
+    version = int(prev.get("version", 0)) + 1 if prev else 1
+
+    df = df.copy()
+    for c in df.columns:
+        # yfinance info fields can mix numbers with None/strings; Arrow needs one type per column
+        if c != "Ticker" and df[c].dtype == object:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"version": str(version).encode(),
+        b"created": str(time.time()).encode(),
+        b"universe": ",".join(universe if universe is not None else df["Ticker"]).encode(),
+    })
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    try:
+        os.replace(tmp, path)
+    except PermissionError as e:
+        # Windows won't replace a file another process still has mapped; try again next cycle
+        print(f"[Snapshot] Publish skipped, file in use: {e}")
+        return None
+    return version
+
+def _meta(schema) -> dict:
+    meta = schema.metadata or {}
+    return {
+        "version": int(meta.get(b"version", b"0")),
+        "created": float(meta.get(b"created", b"0")),
+        "universe": set(filter(None, meta.get(b"universe", b"").decode().split(","))),
+    }
+
+def read_meta(path=SNAPSHOT_FILE) -> dict:
+    """Version/created of a published snapshot, without reading its columns."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with pa.memory_map(path, "r") as source:
+            return _meta(pa.ipc.open_file(source).schema)
+    except Exception as e:
+        print(f"[Snapshot] Could not read {path}: {e}")
+        return {}
+
+def load_snapshot(path=SNAPSHOT_FILE, max_age=None):
+    """
+    Memory-map a published snapshot. Returns (df, meta), or (None, {}) if missing,
+    unreadable or older than max_age seconds.
+    """
+    if not os.path.exists(path):
+        return None, {}
+    try:
+        with pa.memory_map(path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            table = reader.read_all()
+            meta = _meta(reader.schema)
+            if max_age is not None and time.time() - meta["created"] > max_age:
+                return None, meta
+            # to_pandas copies out of the map, so the file can be replaced again once we return
+            df = table.to_pandas()
+    except Exception as e:
+        print(f"[Snapshot] Could not read {path}: {e}")
+        return None, {}
+    return df, meta
@@ -0,0 +1,86 @@
+import threading
+import time
+
+# Seconds between quote refreshes per tier (config.yaml: refresh_tiers)
+TIER_INTERVALS = {"hot": 60, "warm": 300, "cold": 1800}
+
+# Quote-to-quote moves that promote a ticker to hot (config.yaml: refresh_tiers.promote)
+PROMOTE = {"priceMove": 1.0, "volMove": 50.0}
+
+class RefreshScheduler:
+    """
+    Puts tickers into hot/warm/cold tiers, each with its own refresh interval.
+
+    hot:  active ticker alerts, the user's selection, and anything moving
+    warm: current TopPicks
+    cold: everything else
+    Movers are demoted again once a refresh shows them cooling off.
+    """
+    def __init__(self, intervals=None, promote=None):
+        self.intervals = dict(TIER_INTERVALS, **(intervals or {}))
+        self.promote = dict(PROMOTE, **(promote or {}))
+        self.lock = threading.Lock()
+        self.hints = {"alerts": set(), "selected": set(), "top_picks": set()}
+        self.movers = set()
+        self.last = {}  # ticker -> last refresh time
+
+    def configure(self, cfg):
+        cfg = dict(cfg or {})
+        promote = cfg.pop("promote", None) or {}
+        with self.lock:
+            self.intervals.update({k: v for k, v in cfg.items() if k in self.intervals})
+            self.promote.update(promote)
+
+    def hint(self, alerts=None, selected=None, top_picks=None):
+        """Latest alert tickers / selection / TopPicks from the UI or daemon (None = unchanged)."""
+        with self.lock:
+            for name, tickers in (("alerts", alerts), ("selected", selected), ("top_picks", top_picks)):
+                if tickers is not None:
+                    self.hints[name] = set(tickers)
+
+    def tier(self, ticker):
+        with self.lock:
+            return self._tier(ticker)
+
+    def _tier(self, ticker):
+        if ticker in self.hints["alerts"] or ticker in self.hints["selected"] or ticker in self.movers:
+            return "hot"
+        if ticker in self.hints["top_picks"]:
+            return "warm"
+        return "cold"
+
+    def due(self, tickers, now=None):
+        """Tickers whose tier interval has elapsed since their last refresh."""
+        now = now or time.time()
+        with self.lock:
+            return [
+                t for t in tickers
+                if now - self.last.get(t, 0) >= self.intervals[self._tier(t)]
+            ]
+
+    def mark(self, tickers, now=None):
+        now = now or time.time()
+        with self.lock:
+            for t in tickers:
+                self.last[t] = now
+
+    def observe(self, prev_quotes, fresh_quotes):
+        """Promote/demote tickers based on how much they moved since their previous quote."""
+        with self.lock:
+            for t, q in fresh_quotes.items():
+                p = prev_quotes.get(t)
+                if not p or not p.get("Price") or not p.get("Volume"):
+                    continue
+                price_move = abs(q["Price"] / p["Price"] - 1) * 100
+                vol_move = (q["Volume"] / p["Volume"] - 1) * 100
+                if price_move >= self.promote["priceMove"] or vol_move >= self.promote["volMove"]:
+                    self.movers.add(t)
+                else:
+                    self.movers.discard(t)
+
+    def counts(self, tickers):
+        with self.lock:
+            out = {"hot": 0, "warm": 0, "cold": 0}
+            for t in tickers:
+                out[self._tier(t)] += 1
+            return out
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+import threading
+import numpy as np
+
+# Columns that only make sense as a ratio for range predicates
+DERIVED = {
+    "Volume/Avg Vol": lambda df: df["Volume"].to_numpy(dtype=float) / df["Avg Vol"].to_numpy(dtype=float),
+}
+
+class SortedIndex:
+    """argsort of one numeric column; range predicates become a slice of `order`."""
+    def __init__(self, values):
+        v = np.asarray(values, dtype=float)
+        self.nan = np.isnan(v)
+        self.order = np.argsort(v, kind="stable")  # NaNs sort last
+        self.n_valid = int((~self.nan).sum())
+        self.sorted = v[self.order[:self.n_valid]]
+
+    def span(self, op, x):
+        """[lo, hi) positions in `order` whose values satisfy `value <op> x`."""
+        if op == "<=":
+            return 0, int(np.searchsorted(self.sorted, x, side="right"))
+        if op == "<":
+            return 0, int(np.searchsorted(self.sorted, x, side="left"))
+        if op == ">=":
+            return int(np.searchsorted(self.sorted, x, side="left")), self.n_valid
+        if op == ">":
+            return int(np.searchsorted(self.sorted, x, side="right")), self.n_valid
+        raise ValueError(f"Unsupported operator {op}")
+
+class ColumnIndexes:
+    """
+    Sorted indexes for one snapshot frame, built lazily per column.
+    Each (column, op) keeps its last mask; when only its threshold moves, just the rows
+    between the old and new cut-off are flipped.
+    """
+    def __init__(self, df):
+        self.df = df
+        self.lock = threading.Lock()
+        self.indexes = {}
+        self.last = {}  # (col, op, nan_ok) -> (lo, hi, mask)
+
+    def index(self, col):
+        if col not in self.indexes:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = DERIVED[col](self.df) if col in DERIVED else self.df[col].to_numpy()
+                self.indexes[col] = SortedIndex(values)
+        return self.indexes[col]
+
+    def mask(self, col, op, x, nan_ok=False):
+        """Bool mask of `col <op> x`; rows where col is NaN pass only if nan_ok."""
+        with self.lock:
+            return self._mask(col, op, x, nan_ok).copy()
+
+    def _mask(self, col, op, x, nan_ok):
+        ix = self.index(col)
+        key = (col, op, nan_ok)
+        lo, hi = ix.span(op, x)
+
+        prev = self.last.get(key)
+        if prev is None:
+            mask = ix.nan.copy() if nan_ok else np.zeros(len(ix.nan), dtype=bool)
+            mask[ix.order[lo:hi]] = True
+        else:
+            plo, phi, mask = prev
+            # flip only the rows between the old and new cut-offs
+            for a, b in ((min(plo, lo), max(plo, lo)), (min(phi, hi), max(phi, hi))):
+                if a < b:
+                    mask[ix.order[a:b]] = lo <= a and b <= hi
+        self.last[key] = (lo, hi, mask)
+        return mask
+
+_cache = OrderedDict()  # id(df) -> ColumnIndexes (holds the frame so the id stays valid)
+_cache_lock = threading.Lock()  # shared by every session thread
+
+def indexes_for(df, size=8):
+    with _cache_lock:
+        ix = _cache.get(id(df))
+        if ix is None or ix.df is not df:
+            ix = _cache[id(df)] = ColumnIndexes(df)  # cheap: indexes are built lazily
+            while len(_cache) > size:
+                _cache.popitem(last=False)
+        _cache.move_to_end(id(df))
+        return ix
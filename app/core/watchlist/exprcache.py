@@ -0,0 +1,35 @@
+from collections import OrderedDict
+import threading
+
+class ExprCache:
+    """
+    Small process-wide LRU of (expression, snapshot version) -> row mask (or False if the
+    expression is invalid). Shared by the grid's expression filter and alert validation.
+    """
+    def __init__(self, size=64):
+        self.size = size
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expr, version):
+        with self.lock:
+            key = (expr, version)
+            if key in self.items:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return self.items[key]
+            self.misses += 1
+            return None
+
+    def put(self, expr, version, mask):
+        if mask is not False:
+            mask.flags.writeable = False  # shared between sessions
+        with self.lock:
+            self.items[(expr, version)] = mask
+            self.items.move_to_end((expr, version))
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+expr_cache = ExprCache()
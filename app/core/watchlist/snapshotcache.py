@@ -0,0 +1,95 @@
+import hashlib
+import itertools
+import os
+import threading
+import time
+from core.snapshot_store import publish_snapshot, load_snapshot
+
+CACHE_DIR = "data/cache"
+
+_versions = itertools.count(1)
+
+class SnapshotCache:
+    """
+    Stale-while-revalidate cache for watchlist snapshots.
+
+    The last good snapshot is kept in memory and on disk. Expired or warm-started
+    snapshots are served right away while a background thread rebuilds them; the
+    fresh one is swapped in when it's done.
+    """
+    def __init__(self, builder, ttl, cache_dir=CACHE_DIR):
+        self.builder = builder
+        self.ttl = ttl  # callable -> seconds
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.entries = {}       # key -> {"df", "created", "version"}
+        self.refreshing = set()
+
+    def _key(self, tickers):
+        return hashlib.sha1(",".join(tickers).encode()).hexdigest()[:12]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"watchlist_{key}.arrow")
+
+    def get(self, tickers):
+        """Returns the snapshot entry for these tickers, building synchronously only if there's nothing to serve."""
+        tickers = list(tickers)
+        key = self._key(tickers)
+
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            entry = self._warm_start(key)
+        if entry is None:
+            return self._refresh(key, tickers)
+
+        if time.time() - entry["created"] > self.ttl():
+            self._refresh_in_background(key, tickers)
+        return entry
+
+    def is_refreshing(self, tickers):
+        with self.lock:
+            return self._key(list(tickers)) in self.refreshing
+
+    def _entry(self, key, df, created):
+        # every snapshot gets its own version id, carried on the frame for downstream caches
+        version = f"{key}.{next(_versions)}"
+        df.attrs["version"] = version
+        return {"df": df, "created": created, "version": version}
+
+    def _warm_start(self, key):
+        df, meta = load_snapshot(self._path(key))
+        if df is None:
+            return None
+        entry = self._entry(key, df, meta["created"])
+        print(f"[SnapshotCache] Warm start from disk, {int(time.time() - meta['created'])}s old")
+        with self.lock:
+            self.entries.setdefault(key, entry)
+            return self.entries[key]
+
+    def _refresh(self, key, tickers):
+        df = self.builder(tickers)
+        if not df.empty:
+            publish_snapshot(df, universe=tickers, path=self._path(key))
+        entry = self._entry(key, df, time.time())
+        with self.lock:
+            if not df.empty or key not in self.entries:
+                self.entries[key] = entry  # swap in; readers holding the old entry keep it
+            return self.entries[key]
+
+    def _refresh_in_background(self, key, tickers):
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            try:
+                self._refresh(key, tickers)
+            except Exception as e:
+                print(f"[SnapshotCache] Refresh failed: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
@@ -1,73 +1,45 @@
-from core.datafetch import fetch_batch_history
+from core.datafetch import is_market_open, is_extended_hours
+from core.snapshot import SnapshotBuilder
+from core.snapshot_store import load_snapshot
 import pandas as pd
-from ta.momentum import RSIIndicator
-from ta.trend import MACD
-import yfinance as yf
-import pytz
-from datetime import datetime, time
 import streamlit as st
-import concurrent.futures
 import numpy as np  # <-- add
-
-def fetch_infos_parallel(tickers):
-    def fetch_info(tkr):
-        try:
-            return tkr, yf.Ticker(tkr).info
-        except Exception as e:
-            print(f"[INFO FAIL] {tkr}: {e}")
-            return tkr, {}
-    info_map = {}
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        for tkr, info in executor.map(fetch_info, tickers):
-            info_map[tkr] = info
-    return info_map
-
-def is_market_open():
-    now = datetime.now(pytz.timezone("US/Eastern"))
-    return now.weekday() < 5 and time(9, 30) <= now.time() <= time(16, 0)
-
-@st.cache_data(ttl=60 if is_market_open() else 3600)
+from core.singleflight import single_flight
+from core.watchlist.snapshotcache import SnapshotCache
+import time
+import itertools
+
+def snapshot_ttl():
+    # extended-hours prices only move if a bulk provider patches them in
+    live = is_market_open() or (snapshot_builder.bulk is not None and is_extended_hours())
+    return 60 if live else 3600
+
+def load_published_df(tickers: list[str]):
+    """Rows for these tickers from the daemon's published snapshot, or None if stale/incomplete."""
+    snap, meta = load_snapshot(max_age=snapshot_ttl())
+    if snap is None or snap.empty:
+        return None
+    if not set(tickers) <= meta["universe"]:
+        return None  # daemon watches a different universe, don't show a partial grid
+    rows = snap[snap["Ticker"].isin(tickers)]
+    print(f"[Snapshot] Using published snapshot v{meta['version']} ({len(rows)} tickers)")
+    return rows.reset_index(drop=True)
+
+snapshot_builder = SnapshotBuilder()
+
+@single_flight
 def build_watchlist_df(tickers: list[str]) -> pd.DataFrame:
     """Base snapshot (no session-diff moves here)."""
-    hist_all = fetch_batch_history(tickers)
-    info_map = fetch_infos_parallel(tickers)
-    rows = []
-
-    for tkr in tickers:
-        try:
-            h = hist_all.get(tkr) if isinstance(hist_all.columns, pd.MultiIndex) else hist_all
-            if h is None or h.empty or len(h) < 2:
-                print(f"[SKIP] No data for {tkr}")
-                continue
-
-            h = h.copy()
-            h["RSI"] = RSIIndicator(h["Close"], 14).rsi()
-            h["MACD_diff"] = MACD(h["Close"]).macd_diff()
-            last = h.iloc[-1]
-
-            info = info_map.get(tkr, {})
-            so = info.get("sharesOutstanding")
-            mcap = so * last["Close"] if so else info.get("marketCap", 0)
-
-            rows.append({
-                "Ticker":     tkr,
-                "Price":      float(last["Close"]),
-                "RSI":        float(last["RSI"]),
-                "MACD":       float(last["MACD_diff"]),
-                "Volume":     int(last["Volume"]),
-                "Avg Vol":    float(h["Volume"].rolling(20).mean().iloc[-1] if len(h) >= 20 else h["Volume"].mean()),
-                "Market Cap": mcap,
-                "Float":      info.get("floatShares", None),
-                "PE Ratio":   info.get("trailingPE", None),
-                "EPS":        info.get("trailingEps", None),
-                "Pct Change": float((last["Close"] / h["Close"].iloc[-2] - 1) * 100),
-            })
-        except Exception as e:
-            print(f"[ERROR] {tkr}: {e}")
-            continue
-
-    print(f"[DONE] Fetched {len(rows)} tickers.")
-    return pd.DataFrame(rows)
+    published = load_published_df(tickers)
+    if published is not None:
+        return published
+    # During market hours only the latest quotes are fetched between full reloads
+    return snapshot_builder.build(tickers, fast=is_market_open())
+
+_moves_versions = itertools.count(1)
+
+# Last good snapshot per watchlist, served stale while a background refresh runs
+snapshot_cache = SnapshotCache(build_watchlist_df, snapshot_ttl)
 
 # ----- NEW: moves vs previous refresh snapshot (non-cached) -----
 
@@ -86,10 +58,10 @@ def apply_refresh_moves(df: pd.DataFrame) -> pd.DataFrame:
       - rsiMove:   RSI points change since last refresh
     Uses st.session_state['refresh_snapshot'] as the baseline.
     """
-    # ensure columns exist
-    for k in ("priceMove", "volMove", "rsiMove"):
-        if k not in df.columns:
-            df[k] = np.nan
+    # ensure columns exist (assign, not in place: df is the shared cached snapshot)
+    missing = {k: np.nan for k in ("priceMove", "volMove", "rsiMove") if k not in df.columns}
+    if missing:
+        df = df.assign(**missing)
 
     snap = st.session_state.get("refresh_snapshot")
     if not snap or "values" not in snap or not snap["values"]:
@@ -133,10 +105,23 @@ class WatchlistDf:
             raise ValueError("Provide either a file path or a list of tickers")
 
     def build_df(self):
-        # Base (cached)
-        df = build_watchlist_df(self.wl)
-        # Session-based moves (not cached)
+        # Base (stale-while-revalidate, warm-started from disk)
+        entry = snapshot_cache.get(self.wl)
+        self.snapshot_age = time.time() - entry["created"]
+        self.refreshing = snapshot_cache.is_refreshing(self.wl)
+        df = entry["df"]
+        # Session-based moves, memoized per (snapshot, baseline) so reruns reuse the same
+        # frame (and its sorted column indexes)
+        baseline = st.session_state.get("refresh_snapshot")
+        cached = st.session_state.get("_moves_df")
+        if cached is not None and cached[0] is entry and cached[1] is baseline:
+            return cached[2]
         df = apply_refresh_moves(df)
+        if df is entry["df"]:
+            df = df.copy(deep=False)
+        # moves differ per session/baseline, so they get their own version on top of the snapshot's
+        df.attrs["version"] = f"{entry['version']}+{next(_moves_versions)}"
+        st.session_state["_moves_df"] = (entry, baseline, df)
         # Optionally update baseline here if you want (or do it in main after render)
         # st.session_state["refresh_snapshot"] = _make_snapshot(df)
         return df
\ No newline at end of file
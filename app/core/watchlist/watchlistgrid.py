@@ -1,4 +1,3 @@
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, JsCode
 import streamlit as st
 
 class WatchlistGrid:
@@ -6,6 +5,7 @@ class WatchlistGrid:
         self.df = df_pretty
 
     def build_grid(self, col_state=None):
+        from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, JsCode  # lazy, see benchmarks/startup_bench.py
         gb = GridOptionsBuilder.from_dataframe(self.df)
         gb.configure_selection("single", use_checkbox=False)
         gb.configure_column("TopPick", hide=True)
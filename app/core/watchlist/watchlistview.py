@@ -1,6 +1,27 @@
+import numpy as np
 import pandas as pd
+from core.watchlist.colindex import indexes_for
+from core.watchlist.exprcache import expr_cache
+
+# decimals per column for the grid
+ROUNDING = {
+    "Price": 2,
+    "RSI": 2,
+    "MACD": 4,
+    "Volume": 2,
+    "Avg Vol": 2,
+    "Market Cap": 2,
+    "Float": 2,
+    "PE Ratio": 2,
+    "EPS": 2,
+    "Pct Change": 2,
+}
 
 class WatchlistView:
+    """
+    One immutable base snapshot plus boolean masks. Filters (TopPick), search and the
+    expression filter only build masks; rows() makes the single output frame.
+    """
     def __init__(self, watchlistdf: pd.DataFrame):
         self.field_map = {
             "Price": "Price",
@@ -14,57 +35,98 @@ class WatchlistView:
             "EPS": "EPS",
             "PctChange": "Pct Change"
         }
-        self.df = watchlistdf.copy()
-        self.df["TopPick"] = False
-        self.df_pretty = None
+        self.base = watchlistdf  # shared snapshot, never modified
+        self.version = watchlistdf.attrs.get("version")  # set by WatchlistDf.build_df
+        self.top = np.zeros(len(watchlistdf), dtype=bool)
+        self.masks = {}  # name -> bool array, ANDed into the visible rows
+        self.extra = {}  # name -> array aligned with base, added as grid columns
 
     def apply_filters(self, price, rsi, vol, mc, float, only_macd, pe_max, eps_min, pct_min):
+        # range predicates answered from sorted column indexes (binary search + mask AND)
+        ix = indexes_for(self.base)
         cond = (
-            (self.df["Price"]      <= price) &
-            (self.df["RSI"]        <= rsi) &
-            (self.df["Volume"]     >  vol * self.df["Avg Vol"]) &
-            (self.df["Market Cap"] <= mc) &
-            ((self.df["Float"].isna()) | (self.df["Float"] <= float)) &
-            ((self.df["PE Ratio"].isna()) | (self.df["PE Ratio"] <= pe_max)) &
-            ((self.df["EPS"].isna()) | (self.df["EPS"] >= eps_min)) &
-            (self.df["Pct Change"] >= pct_min)
+            ix.mask("Price", "<=", price) &
+            ix.mask("RSI", "<=", rsi) &
+            ix.mask("Volume/Avg Vol", ">", vol) &
+            ix.mask("Market Cap", "<=", mc) &
+            ix.mask("Float", "<=", float, nan_ok=True) &
+            ix.mask("PE Ratio", "<=", pe_max, nan_ok=True) &
+            ix.mask("EPS", ">=", eps_min, nan_ok=True) &
+            ix.mask("Pct Change", ">=", pct_min)
         )
         if only_macd:
-            cond &= self.df["MACD"] > 0
-        self.df["TopPick"] = cond
-
-
-    def format_df(self):
-        d = self.df.copy()
-        d["Price"]       = d["Price"].round(2)
-        d["RSI"]         = d["RSI"].round(2)
-        d["MACD"]        = d["MACD"].round(4)
-        d["Volume"]      = d["Volume"].round(2)
-        d["Avg Vol"]     = d["Avg Vol"].round(2)
-        d["Market Cap"]  = d["Market Cap"].round(2)
-        d["Float"]       = d["Float"].round(2)
-        d["PE Ratio"]    = d["PE Ratio"].round(2)
-        d["EPS"]         = d["EPS"].round(2)
-        d["Pct Change"]  = d["Pct Change"].round(2)
-        self.df_pretty = d
+            cond &= ix.mask("MACD", ">", 0)
+        self.top = cond
 
     def search(self, searchtxt):
         if searchtxt:
-            mask = self.df_pretty["Ticker"].str.contains(searchtxt, case=False)
-            self.df = self.df[mask.values]
-            self.df_pretty = self.df_pretty[mask]
-        return (self.df, self.df_pretty)
+            mask = self.base["Ticker"].str.contains(searchtxt, case=False)
+            self.masks["search"] = mask.to_numpy(dtype=bool)
+        else:
+            self.masks.pop("search", None)
+        return self.masks.get("search")
 
     def expr(self, exprtxt):
+        """Set the expression mask. Returns the mask (None if empty) or False if invalid."""
+        mask = self.expr_mask(exprtxt)
+        if mask is False:
+            return False
+        if mask is None:
+            self.masks.pop("expr", None)
+        else:
+            self.masks["expr"] = mask
+        return mask
+
+    def expr_mask(self, exprtxt):
+        """Evaluate an expression without touching the view (used to validate alerts)."""
+        if not exprtxt:
+            return None
+        if self.version is not None:
+            cached = expr_cache.get(exprtxt, self.version)
+            if cached is not None:
+                return cached
+        mask = self._eval_expr(exprtxt)
+        if self.version is not None:
+            expr_cache.put(exprtxt, self.version, mask)
+        return mask
+
+    def _eval_expr(self, exprtxt):
         try:
-            if exprtxt:
-                parsed_expr = self.parse_query(exprtxt, self.field_map)
-                self.df = self.df.query(parsed_expr)
-                self.df_pretty = self.df_pretty[self.df_pretty["Ticker"].isin(self.df["Ticker"])]
-            return (self.df, self.df_pretty)
+            parsed_expr = self.parse_query(exprtxt, self.field_map)
+            result = self.base.eval(parsed_expr)
+            if not isinstance(result, pd.Series) or result.dtype != bool:
+                return False
+            return result.to_numpy()
         except Exception as e:
             return False
 
+    def visible(self):
+        mask = np.ones(len(self.base), dtype=bool)
+        for m in self.masks.values():
+            mask &= m
+        return mask
+
+    def rows(self, pretty=True):
+        """Visible rows, TopPicks first. pretty rounds for display and fills blanks with N/A."""
+        vis = self.visible()
+        idx = np.concatenate([np.flatnonzero(vis & self.top), np.flatnonzero(vis & ~self.top)])
+
+        cols = {}
+        for c in self.base.columns:
+            v = self.base[c].to_numpy()[idx]
+            if pretty:
+                if c in ROUNDING:
+                    v = np.round(np.asarray(v, dtype=float), ROUNDING[c])
+                blank = pd.isna(v)
+                if blank.any():
+                    v = v.astype(object)
+                    v[blank] = "N/A"
+            cols[c] = v
+        for c, v in self.extra.items():
+            cols[c] = v[idx]
+        cols["TopPick"] = self.top[idx]
+        return pd.DataFrame(cols)
+
     def parse_query(self, query, field_map):
         import re
         expr = query
@@ -1,9 +1,12 @@
+import numpy as np
 import pandas as pd
+from core.profiles import evaluate_profiles
 
 class YamlPicks:
-    def __init__(self, filters, df):
+    def __init__(self, filters, df, mask=None):
         self.filters = filters
         self.df = df
+        self.mask = mask  # optional row mask (e.g. the view's search/expression filters)
 
     def get(self):
         # pull original filter values from config.yaml
@@ -16,45 +19,49 @@ class YamlPicks:
         min_pct_change  = self.filters.get("pct_min", None)
         max_pe_ratio    = self.filters.get("pe_max", None)
 
-        # base filter
-        cond = (
-            (self.df["Price"] <= price_ceiling) &
-            (self.df["RSI"] <= rsi_threshold) &
-            (self.df["Volume"] > volume_multiplier * self.df["Avg Vol"]) &
-            (self.df["Market Cap"] <= market_cap_ceiling) &
-            ((self.df["Float"].isna()) | (self.df["Float"] <= float_ceiling))
-        )
+        # same evaluator as the filter profiles; eps_min isn't part of the YAML picks
+        profile = {
+            "price_ceiling":      price_ceiling,
+            "rsi_threshold":      rsi_threshold,
+            "volume_multiplier":  volume_multiplier,
+            "market_cap_ceiling": market_cap_ceiling,
+            "float_ceiling":      float_ceiling,
+            "only_positive_macd": macd_enabled,
+            "pct_min":            min_pct_change,
+            "pe_max":             max_pe_ratio,
+        }
+        cond = evaluate_profiles(self.df, {"yaml": profile})["yaml"].to_numpy()
 
-        # optional filters
+        if self.mask is not None:
+            cond &= self.mask
+        df_picks = self.df[cond]
+        if df_picks.empty:
+            return {}
+
+        # reasons built column-wise: one string Series per clause, joined once
+        d = df_picks
+        clauses = [
+            (d["Price"] <= price_ceiling,
+             "Price " + d["Price"].map("{:.2f}".format) + f"≤{price_ceiling}"),
+            (d["RSI"] <= rsi_threshold,
+             "RSI " + d["RSI"].map("{:.1f}".format) + f"≤{rsi_threshold}"),
+            (d["Volume"] > volume_multiplier * d["Avg Vol"], "Vol spike"),
+            (d["Market Cap"] <= market_cap_ceiling, f"MCap≤{market_cap_ceiling:,}"),
+            (d["Float"].notna() & (d["Float"] <= float_ceiling), f"Float≤{float_ceiling:,}"),
+        ]
         if macd_enabled:
-            cond &= self.df["MACD"] > 0
+            clauses.append((d["MACD"] > 0, "MACD+"))
         if min_pct_change is not None:
-            cond &= self.df["Pct Change"] >= float(min_pct_change)
+            clauses.append((d["Pct Change"] >= min_pct_change,
+                            "Pct+" + d["Pct Change"].map("{:.1f}".format)))
         if max_pe_ratio is not None:
-            cond &= (self.df["PE Ratio"].isna() | (self.df["PE Ratio"] <= float(max_pe_ratio)))
-
-        df_picks = self.df[cond]
-        result = {}
-
-        for _, row in df_picks.iterrows():
-            reasons = []
-            if row["Price"] <= price_ceiling:
-                reasons.append(f"Price {row['Price']:.2f}≤{price_ceiling}")
-            if row["RSI"] <= rsi_threshold:
-                reasons.append(f"RSI {row['RSI']:.1f}≤{rsi_threshold}")
-            if row["Volume"] > volume_multiplier * row["Avg Vol"]:
-                reasons.append("Vol spike")
-            if row["Market Cap"] <= market_cap_ceiling:
-                reasons.append(f"MCap≤{market_cap_ceiling:,}")
-            if pd.notna(row["Float"]) and row["Float"] <= float_ceiling:
-                reasons.append(f"Float≤{float_ceiling:,}")
-            if macd_enabled and row["MACD"] > 0:
-                reasons.append("MACD+")
-            if min_pct_change is not None and row["Pct Change"] >= min_pct_change:
-                reasons.append(f"Pct+{row['Pct Change']:.1f}")
-            if max_pe_ratio is not None and (pd.isna(row["PE Ratio"]) or row["PE Ratio"] <= max_pe_ratio):
-                reasons.append(f"PE≤{max_pe_ratio}")
+            clauses.append((d["PE Ratio"].isna() | (d["PE Ratio"] <= max_pe_ratio), f"PE≤{max_pe_ratio}"))
 
-            result[row["Ticker"]] = "; ".join(reasons)
+        reasons = np.full(len(d), "", dtype=object)
+        for mask, text in clauses:
+            mask = mask.to_numpy(dtype=bool)
+            text = text.to_numpy(dtype=object) if isinstance(text, pd.Series) else text
+            sep = np.where(reasons == "", "", "; ")
+            reasons = np.where(mask, reasons + sep + text, reasons)
 
-        return result
+        return dict(zip(d["Ticker"], reasons))
@@ -1,10 +1,9 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import yaml
 from datetime import datetime, timedelta
 import pytz
-from alerts.alerts import check_alerts
+from alerts.alerts import check_alerts, load_alerts, triggered_tickers
 import logging
 import sys
 import json
@@ -13,15 +12,23 @@ import re, os
 
 
 # Core functionality
-from core.watchlist.watchlistdf import WatchlistDf
+from core.watchlist.watchlistdf import WatchlistDf, snapshot_builder
 from core.watchlist.watchlistview import WatchlistView
 from core.watchlist.watchlistgrid import WatchlistGrid
 from core.yaml_picks import YamlPicks
+from core.profiles import evaluate_profiles, matching_profiles
+from core.singleflight import flight
+from core.polygon_bulk import bulk_from_config
 
 # Chart UI
 from ui.chart import Chart
-from core.news import get_news
+from ui.prefetch import prefetcher, prefetch_candidates
+from ui.multichart import small_multiples, MAX_TICKERS
+from core.news import ticker_news
+from core.newsstore import search_news
+from core import sentiment, ratelimit
 from alerts.alerts_ui import show_alert_modal  # new import for alert modal
+from ui.fragments import timed_fragment
 from streamlit_autorefresh import st_autorefresh
 
 # Set up logging
@@ -68,6 +75,9 @@ class StreamToLogger:
 
 sys.stdout = StreamToLogger(logging.info)
 
+# what the filter inputs show for keys a profile leaves out (DNA imports can omit these)
+SLIDER_DEFAULTS = {"float_ceiling": 0.0, "pe_max": 20.0, "eps_min": -10.0, "pct_min": -50.0}
+
 with open("config.yaml") as f:
     config = yaml.safe_load(f)
 filters = config["filters"]
@@ -77,6 +87,12 @@ alpha_key = config.get("api_keys", {}).get("alpha")
 has_polygon = bool(polygon_key and polygon_key != "YOUR_API_KEY_HERE")
 has_alpha = bool(alpha_key and alpha_key != "YOUR_API_KEY_HERE")
 news_limit = config.get("news_limit")
+chart_width = config.get("chart_width_px", 1200)
+snapshot_builder.scheduler.configure(config.get("refresh_tiers"))
+snapshot_builder.bulk = bulk_from_config(config)
+ratelimit.configure(config.get("rate_limits"))
+prefetcher.configure(config.get("prefetch"))
+sentiment.configure(config.get("sentiment"))
 
 st.set_page_config(layout="wide")
 # Inject dark mode theme
@@ -97,178 +113,170 @@ body {
 st.markdown(dark_mode_css, unsafe_allow_html=True)
 st.title("🌒 Moon Sniper v0.2.1")
 st.markdown("[by @ufywufy](https://github.com/ufywufy)", unsafe_allow_html=True)
-col1, col2 = st.columns([5, 4])
-
-# RIGHT COLUMN SLIDERS AND STUFF
-
-with col2:
-    st.subheader("⚙️ Filters")
-    filters_path = "filters.json"
-    if "selected_profile" not in st.session_state:
-        st.session_state.selected_profile = "(None)"
-    if "show_import_filter" not in st.session_state:
-        st.session_state["show_import_filter"] = False
-    try:
+d = WatchlistDf(watchlist_path)
+df = d.build_df()
+check_alerts(df, config)
+
+# Each panel is a fragment: its widgets only rerun that panel. Anything that changes
+# what other panels show (row selection, auto-refresh) triggers a full st.rerun().
+
+@timed_fragment("filters + grid")
+def screen_panel():
+    col1, col2 = st.columns([5, 4])
+
+    # RIGHT COLUMN SLIDERS AND STUFF
+
+    with col2:
+        st.subheader("⚙️ Filters")
+        filters_path = "filters.json"
+        if "selected_profile" not in st.session_state:
+            st.session_state.selected_profile = "(None)"
+        if "show_import_filter" not in st.session_state:
+            st.session_state["show_import_filter"] = False
+        profile_matrix = None
         try:
-            with open(filters_path) as f:
-                filter_profiles = json.load(f)
-        except Exception as e:
-            st.warning("⚠️ Could not load filters.json.")
-        profile_names = ["(None)"] + list(filter_profiles.keys())
-        if "pending_profile_select" in st.session_state:
-            p = profile_names.index(st.session_state.pending_profile_select)
-            st.session_state.selected_profile = st.selectbox("🎯 Choose Filter Profile", profile_names, index=p)
-        else:
-            st.session_state.selected_profile = st.selectbox("🎯 Choose Filter Profile", profile_names)
-        col_dna1, col_dna2 = st.columns([1, 1])
-        with col_dna1:
-            if st.button("🧬 Export DNA", key="export_dna_filter"):
-                export_dna("filter")
-        with col_dna2:
-            if st.button("🧬 Import DNA", key="import_dna_filter"):
-                st.session_state["show_import_filter"] = True
-        if st.session_state.show_import_filter:
-            dna_input = st.text_area("Paste DNA filter strings (one per line):", height=150, placeholder="ex: ms:filter,Under the Radar,pc<10,rsit<50,vm<0.7,mcc:1KKK,fc:25KK")
-            c1, c2 = st.columns([1, 1])  # Adjust width ratio if needed
-            with c1:
-                if st.button("💾 Import", key="confirm_import_filter"):
-                    st.session_state["show_import_filter"] = False
-                    import_dna("filter", dna_input)
-                    
-            with c2:
-                if st.button("❌ Cancel", key="cancel_import_filter"):
+            try:
+                with open(filters_path) as f:
+                    filter_profiles = json.load(f)
+            except Exception as e:
+                st.warning("⚠️ Could not load filters.json.")
+            profile_names = ["(None)"] + list(filter_profiles.keys())
+            # every profile screened in one pass, hit counts shown in the selector
+            profile_matrix = evaluate_profiles(df, filter_profiles, SLIDER_DEFAULTS)
+            profile_hits = profile_matrix.sum().to_dict()
+            def profile_label(name):
+                return f"{name} ({profile_hits[name]} hits)" if name in profile_hits else name
+            if "pending_profile_select" in st.session_state:
+                p = profile_names.index(st.session_state.pending_profile_select)
+                st.session_state.selected_profile = st.selectbox("🎯 Choose Filter Profile", profile_names, index=p, format_func=profile_label)
+            else:
+                st.session_state.selected_profile = st.selectbox("🎯 Choose Filter Profile", profile_names, format_func=profile_label)
+            col_dna1, col_dna2 = st.columns([1, 1])
+            with col_dna1:
+                if st.button("🧬 Export DNA", key="export_dna_filter"):
+                    export_dna("filter")
+            with col_dna2:
+                if st.button("🧬 Import DNA", key="import_dna_filter"):
+                    st.session_state["show_import_filter"] = True
+            if st.session_state.show_import_filter:
+                dna_input = st.text_area("Paste DNA filter strings (one per line):", height=150, placeholder="ex: ms:filter,Under the Radar,pc<10,rsit<50,vm<0.7,mcc:1KKK,fc:25KK")
+                c1, c2 = st.columns([1, 1])  # Adjust width ratio if needed
+                with c1:
+                    if st.button("💾 Import", key="confirm_import_filter"):
                         st.session_state["show_import_filter"] = False
-                        st.rerun()
-        # Use profile as defaults if selected
-        default_vals = filter_profiles[st.session_state.selected_profile] if st.session_state.selected_profile != "(None)" else filters
-        # After the selectbox for selected_profile
-        if "last_profile" not in st.session_state:
-            st.session_state.last_profile = st.session_state.selected_profile
-
-        # Reset state if dropdown changed
-        if st.session_state.last_profile != st.session_state.selected_profile:
-            for key in ["price_ceiling", "rsi_threshold", "volume_multiplier", "market_cap_ceiling", "float_ceiling"]:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.session_state.last_profile = st.session_state.selected_profile
-            unsaved_changes = False  # prevent flag from showing
-            st.rerun()  # force refresh to sync inputs
+                        import_dna("filter", dna_input)
+                    
+                with c2:
+                    if st.button("❌ Cancel", key="cancel_import_filter"):
+                            st.session_state["show_import_filter"] = False
+                            st.rerun()
+            # Use profile as defaults if selected
+            default_vals = filter_profiles[st.session_state.selected_profile] if st.session_state.selected_profile != "(None)" else filters
+            # After the selectbox for selected_profile
+            if "last_profile" not in st.session_state:
+                st.session_state.last_profile = st.session_state.selected_profile
+
+            # Reset state if dropdown changed
+            if st.session_state.last_profile != st.session_state.selected_profile:
+                for key in ["price_ceiling", "rsi_threshold", "volume_multiplier", "market_cap_ceiling", "float_ceiling"]:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                st.session_state.last_profile = st.session_state.selected_profile
+                unsaved_changes = False  # prevent flag from showing
+                st.rerun()  # force refresh to sync inputs
 
-    except Exception as e:
-        default_vals = filters
-
-    # Auto generate default name if creating new
-    def generate_default_name(existing):
-        base = "Profile"
-        i = 1
-        while f"{base} {i}" in existing:
-            i += 1
-        return f"{base} {i}"
-
-    pc_col1, pc_col2 = st.columns([3, 1])
-    with pc_col1:
-        price_c = st.slider("Price Ceiling ($)", 0.5, 1000.0, float(default_vals["price_ceiling"]))
-    with pc_col2:
-        price_c_input = st.number_input(" ", value=price_c, step=0.5, format="%.2f")
-        if price_c_input != price_c:
-            price_c = price_c_input
-
-    rsi_col1, rsi_col2 = st.columns([3, 1])
-    with rsi_col1:
-        rsi_c = st.slider("RSI Threshold", 10, 100, int(default_vals["rsi_threshold"]))
-    with rsi_col2:
-        rsi_input = st.number_input(" ", min_value=1, max_value=999, value=rsi_c)
-        if rsi_input != rsi_c:
-            rsi_c = rsi_input
-
-    vol_col1, vol_col2 = st.columns([3, 1])
-    with vol_col1:
-        vol_mul = st.slider("Volume × avg", 0.0, 10.0, float(default_vals["volume_multiplier"]))
-    with vol_col2:
-        vol_input = st.number_input(" ", min_value=0.0, value=vol_mul, step=0.1)
-        if vol_input != vol_mul:
-            vol_mul = vol_input
-    pe_col1, pe_col2 = st.columns([3, 1])
-    with pe_col1:
-        pe_max = st.slider("PE Ratio Max", 0.0, 100.0, float(default_vals.get("pe_max", 20.0)))
-    with pe_col2:
-        pe_input = st.number_input(" ", value=pe_max, step=0.1)
-        if pe_input != pe_max:
-            pe_max = pe_input
-    eps_col1, eps_col2 = st.columns([3, 1])
-    with eps_col1:
-        eps_min = st.slider("EPS Minimum", -30.0, 50.0, float(default_vals.get("eps_min", -10.0)))
-    with eps_col2:
-        eps_input = st.number_input(" ", value=eps_min, step=0.1)
-        if eps_input != eps_min:
-            eps_min = eps_input
-    pct_col1, pct_col2 = st.columns([3, 1])
-    with pct_col1:
-        pct_min = st.slider("% Change Min", -50.0, 50.0, float(default_vals.get("pct_min", -50.0)))
-    with pct_col2:
-        pct_input = st.number_input(" ", value=pct_min, step=1.0)
-        if pct_input != pct_min:
-            pct_min = pct_input
-
-
-
-    mc_col, float_col = st.columns(2)
-    with mc_col:
-        market_cap_c = st.number_input(
-            "Market Cap Ceiling", min_value=0.0,
-            value=float(default_vals["market_cap_ceiling"]),
-            step=100_000.0, format="%.0f"
-        )
-        st.markdown(f"{market_cap_c:,.0f}", unsafe_allow_html=True)
+        except Exception as e:
+            default_vals = filters
+
+        # Auto generate default name if creating new
+        def generate_default_name(existing):
+            base = "Profile"
+            i = 1
+            while f"{base} {i}" in existing:
+                i += 1
+            return f"{base} {i}"
+
+        pc_col1, pc_col2 = st.columns([3, 1])
+        with pc_col1:
+            price_c = st.slider("Price Ceiling ($)", 0.5, 1000.0, float(default_vals["price_ceiling"]))
+        with pc_col2:
+            price_c_input = st.number_input(" ", value=price_c, step=0.5, format="%.2f")
+            if price_c_input != price_c:
+                price_c = price_c_input
+
+        rsi_col1, rsi_col2 = st.columns([3, 1])
+        with rsi_col1:
+            rsi_c = st.slider("RSI Threshold", 10, 100, int(default_vals["rsi_threshold"]))
+        with rsi_col2:
+            rsi_input = st.number_input(" ", min_value=1, max_value=999, value=rsi_c)
+            if rsi_input != rsi_c:
+                rsi_c = rsi_input
+
+        vol_col1, vol_col2 = st.columns([3, 1])
+        with vol_col1:
+            vol_mul = st.slider("Volume × avg", 0.0, 10.0, float(default_vals["volume_multiplier"]))
+        with vol_col2:
+            vol_input = st.number_input(" ", min_value=0.0, value=vol_mul, step=0.1)
+            if vol_input != vol_mul:
+                vol_mul = vol_input
+        pe_col1, pe_col2 = st.columns([3, 1])
+        with pe_col1:
+            pe_max = st.slider("PE Ratio Max", 0.0, 100.0, float(default_vals.get("pe_max", SLIDER_DEFAULTS["pe_max"])))
+        with pe_col2:
+            pe_input = st.number_input(" ", value=pe_max, step=0.1)
+            if pe_input != pe_max:
+                pe_max = pe_input
+        eps_col1, eps_col2 = st.columns([3, 1])
+        with eps_col1:
+            eps_min = st.slider("EPS Minimum", -30.0, 50.0, float(default_vals.get("eps_min", SLIDER_DEFAULTS["eps_min"])))
+        with eps_col2:
+            eps_input = st.number_input(" ", value=eps_min, step=0.1)
+            if eps_input != eps_min:
+                eps_min = eps_input
+        pct_col1, pct_col2 = st.columns([3, 1])
+        with pct_col1:
+            pct_min = st.slider("% Change Min", -50.0, 50.0, float(default_vals.get("pct_min", SLIDER_DEFAULTS["pct_min"])))
+        with pct_col2:
+            pct_input = st.number_input(" ", value=pct_min, step=1.0)
+            if pct_input != pct_min:
+                pct_min = pct_input
+
+
+
+        mc_col, float_col = st.columns(2)
+        with mc_col:
+            market_cap_c = st.number_input(
+                "Market Cap Ceiling", min_value=0.0,
+                value=float(default_vals["market_cap_ceiling"]),
+                step=100_000.0, format="%.0f"
+            )
+            st.markdown(f"{market_cap_c:,.0f}", unsafe_allow_html=True)
 
-    with float_col:
-        float_c = st.number_input(
-            "Float Ceiling", min_value=0.0,
-            value=float(default_vals.get("float_ceiling", 0)),
-            step=100_000.0, format="%.0f"
-        )
-        st.markdown(f"{float_c:,.0f}", unsafe_allow_html=True)
+        with float_col:
+            float_c = st.number_input(
+                "Float Ceiling", min_value=0.0,
+                value=float(default_vals.get("float_ceiling", SLIDER_DEFAULTS["float_ceiling"])),
+                step=100_000.0, format="%.0f"
+            )
+            st.markdown(f"{float_c:,.0f}", unsafe_allow_html=True)
 
-    macd_c = default_vals.get("only_positive_macd", False)
+        macd_c = default_vals.get("only_positive_macd", False)
 
-    profile_form_col1, profile_form_col2 = st.columns([3, 1])
+        profile_form_col1, profile_form_col2 = st.columns([3, 1])
 
-    # If editing existing profile
-    if st.session_state.selected_profile != "(None)":
-        profile_name = profile_form_col1.text_input("Profile Name", value=st.session_state.selected_profile)
-        save_label = "Save current profile"
-    else:
-        default_name = generate_default_name(filter_profiles.keys())
-        profile_name = profile_form_col1.text_input("Profile Name", value=default_name)
-        save_label = "Save as a new profile"
-
-    unsaved_changes = False
-    if st.session_state.selected_profile != "(None)":
-        saved = filter_profiles[st.session_state.selected_profile]
-        current = {
-            "price_ceiling": price_c,
-            "rsi_threshold": rsi_c,
-            "volume_multiplier": vol_mul,
-            "market_cap_ceiling": market_cap_c,
-            "float_ceiling": float_c,
-            "only_positive_macd": macd_c,
-            "pe_max": pe_max,
-            "eps_min": eps_min,
-            "pct_min": pct_min
-        }
-        for k in current:
-            if current[k] != saved.get(k):
-                unsaved_changes = True
-                break
-        if profile_name != st.session_state.selected_profile:
-            unsaved_changes = True
-
-    if unsaved_changes:
-        st.markdown('<span style="color:orange"><strong>Unsaved profile changes</strong></span>', unsafe_allow_html=True)
-    # Save button
-    with profile_form_col2:
-        if st.button(save_label):
-            new_profile = {
+        # If editing existing profile
+        if st.session_state.selected_profile != "(None)":
+            profile_name = profile_form_col1.text_input("Profile Name", value=st.session_state.selected_profile)
+            save_label = "Save current profile"
+        else:
+            default_name = generate_default_name(filter_profiles.keys())
+            profile_name = profile_form_col1.text_input("Profile Name", value=default_name)
+            save_label = "Save as a new profile"
+
+        unsaved_changes = False
+        if st.session_state.selected_profile != "(None)":
+            saved = filter_profiles[st.session_state.selected_profile]
+            current = {
                 "price_ceiling": price_c,
                 "rsi_threshold": rsi_c,
                 "volume_multiplier": vol_mul,
@@ -278,117 +286,163 @@ with col2:
                 "pe_max": pe_max,
                 "eps_min": eps_min,
                 "pct_min": pct_min
-
             }
+            for k in current:
+                if current[k] != saved.get(k):
+                    unsaved_changes = True
+                    break
+            if profile_name != st.session_state.selected_profile:
+                unsaved_changes = True
 
-            try:
-                # If renaming an existing profile
-                if st.session_state.selected_profile != "(None)" and profile_name != st.session_state.selected_profile:
-                    filter_profiles.pop(st.session_state.selected_profile, None)
-
-                # Overwrite or add new
-                filter_profiles[profile_name] = new_profile
-
-                # Write to JSON
-                with open(filters_path, "w") as f:
-                    json.dump(filter_profiles, f, indent=2)
-
-                st.success(f"✅ Profile '{profile_name}' saved.")
-                st.session_state.pending_profile_select = profile_name
-                st.rerun()
+        if unsaved_changes:
+            st.markdown('<span style="color:orange"><strong>Unsaved profile changes</strong></span>', unsafe_allow_html=True)
+        # Save button
+        with profile_form_col2:
+            if st.button(save_label):
+                new_profile = {
+                    "price_ceiling": price_c,
+                    "rsi_threshold": rsi_c,
+                    "volume_multiplier": vol_mul,
+                    "market_cap_ceiling": market_cap_c,
+                    "float_ceiling": float_c,
+                    "only_positive_macd": macd_c,
+                    "pe_max": pe_max,
+                    "eps_min": eps_min,
+                    "pct_min": pct_min
+
+                }
 
-            except Exception as e:
-                st.error(f"❌ Failed to save profile: {e}")
-        if st.session_state.selected_profile != "(None)":
-            if st.button("🗑 Delete this profile"):
                 try:
-                    filter_profiles.pop(st.session_state.selected_profile, None)
+                    # If renaming an existing profile
+                    if st.session_state.selected_profile != "(None)" and profile_name != st.session_state.selected_profile:
+                        filter_profiles.pop(st.session_state.selected_profile, None)
+
+                    # Overwrite or add new
+                    filter_profiles[profile_name] = new_profile
 
-                    # Save the updated profiles
+                    # Write to JSON
                     with open(filters_path, "w") as f:
                         json.dump(filter_profiles, f, indent=2)
 
-                    st.success(f"🗑 Profile '{st.session_state.selected_profile}' deleted.")
-                    st.session_state.pending_profile_select = "(None)"
+                    st.success(f"✅ Profile '{profile_name}' saved.")
+                    st.session_state.pending_profile_select = profile_name
                     st.rerun()
 
                 except Exception as e:
-                    st.error(f"❌ Failed to delete profile: {e}")
-
-
-
-
-    #sniper picks
-    st.subheader("🔫 YAML Picks")
-    now = datetime.now().strftime("%b %d, %Y %H:%M")
-    st.write(f"_As of **{now}**_")
-
-    picks_placeholder = st.empty()
+                    st.error(f"❌ Failed to save profile: {e}")
+            if st.session_state.selected_profile != "(None)":
+                if st.button("🗑 Delete this profile"):
+                    try:
+                        filter_profiles.pop(st.session_state.selected_profile, None)
+
+                        # Save the updated profiles
+                        with open(filters_path, "w") as f:
+                            json.dump(filter_profiles, f, indent=2)
+
+                        st.success(f"🗑 Profile '{st.session_state.selected_profile}' deleted.")
+                        st.session_state.pending_profile_select = "(None)"
+                        st.rerun()
 
-# LEFT COLUMN BUILD CHART
+                    except Exception as e:
+                        st.error(f"❌ Failed to delete profile: {e}")
+
+
+
+
+        #sniper picks
+        st.subheader("🔫 YAML Picks")
+        now = datetime.now().strftime("%b %d, %Y %H:%M")
+        st.write(f"_As of **{now}**_")
+        sf = flight.stats()
+        st.caption(f"Upstream calls coalesced: {sf['coalesced']} of {sf['calls']}")
+
+        picks_placeholder = st.empty()
+
+    # LEFT COLUMN WATCHLIST
+
+    with col1:
+        # apply filters (masks only, nothing is copied until view.rows())
+        view = WatchlistView(df)
+        view.apply_filters(price_c, rsi_c, vol_mul, market_cap_c, float_c, macd_c, pe_max, eps_min, pct_min)
+        search = st.text_input("🔎 Search watchlist")
+        view.search(search)
+
+        st.markdown("🔍 Advanced Filter Expression")
+        user_filter_expr = st.text_input("Enter expression (ex: RSI < 30 and Price < 5 and MarketCap > 1000000)")
+        if view.expr(user_filter_expr) is False:
+            st.error("Invalid expression")
+
+        if profile_matrix is not None and st.checkbox("🎯 Show matching profiles column", key="show_profiles_col"):
+            view.extra["Profiles"] = matching_profiles(profile_matrix)
+
+        # the one output frame: visible rows, picks first, formatted for the grid
+        df_pretty = view.rows()
+        # session state for selection
+        if "sel_ticker" not in st.session_state:
+            st.session_state.sel_ticker = df_pretty["Ticker"].iat[0]
+
+        # render grid
+        st.subheader("📋 Watchlist (click a row)")
+        age = int(d.snapshot_age)
+        age_txt = f"{age}s" if age < 120 else f"{age // 60}m"
+        st.caption(f"Snapshot age: {age_txt}" + (" · refreshing in background…" if d.refreshing else ""))
+        r = WatchlistGrid(df_pretty)
+        grid = r.build_grid(col_state=st.session_state.get("watchlist_col_state"))
+        selected = grid.get("selected_rows", [])
+
+        if selected is not None and len(selected) > 0:
+            if len(selected) > 1:
+                selected = [selected[-1]]
+            if selected["Ticker"].iloc[0] != st.session_state.sel_ticker:
+                st.session_state.sel_ticker = selected["Ticker"].iloc[0]
+                st.rerun()  # chart + news follow the selection
+
+        #top picks button
+        top_picks = df_pretty.loc[df_pretty["TopPick"], "Ticker"].tolist()
+        st.session_state["top_picks"] = top_picks
+        # refresh hot tickers (alerts, selection, movers) more often than the rest
+        snapshot_builder.scheduler.hint(
+            alerts=load_alerts()[0].keys(),
+            selected=[st.session_state.sel_ticker],
+            top_picks=top_picks,
+        )
+        # warm the chart cache for the likely next clicks (chart panel kicks it off)
+        st.session_state["prefetch_candidates"] = prefetch_candidates(
+            df_pretty["Ticker"], st.session_state.sel_ticker, top_picks, triggered_tickers()
+        )
+        if top_picks:
+            if st.button("📄 Export filtered rows to TXT"):
+                os.makedirs("output", exist_ok=True)
+
+                # Find next available filename
+                base_name = "top_picks"
+                existing = os.listdir("output")
+                nums = [
+                    int(match.group(1))
+                    for f in existing
+                    if (match := re.match(rf"{base_name}(\d*)\.txt", f)) and match.group(1)
+                ]
+                next_num = max(nums, default=0) + 1
+                filename = f"{base_name}{next_num if next_num > 1 else ''}.txt"
+                file_path = os.path.join("output", filename)
+
+                with open(file_path, "w") as f:
+                    for t in top_picks:
+                        f.write(f"{t}\n")
+
+                st.success(f"✅ Exported {len(top_picks)} tickers to {file_path}")
+
+    with col2:
+        picks = YamlPicks(filters, view.base, mask=view.visible()).get()
+        if picks:
+            for ticker, reasons in picks.items():
+                st.markdown(f"<span style='color:gold'><strong>{ticker}</strong>: {reasons}</span>", unsafe_allow_html=True)
+        else:
+            st.write("_No picks under YAML filters._")
 
-with col1:
-    
-    d = WatchlistDf(watchlist_path)
-    df = d.build_df()
-    _df_for_snapshot = df.copy()
-    # apply filters
-    view = WatchlistView(df)
-    view.apply_filters(price_c, rsi_c, vol_mul, market_cap_c, float_c, macd_c, pe_max, eps_min, pct_min)
-    view.format_df()
-    check_alerts(view.df, config)
-    search = st.text_input("🔎 Search watchlist")
-    (df, df_pretty) = view.search(search)
 
-    st.markdown("🔍 Advanced Filter Expression")
-    user_filter_expr = st.text_input("Enter expression (ex: RSI < 30 and Price < 5 and MarketCap > 1000000)")
-    try:
-        (df, df_pretty) = view.expr(user_filter_expr)
-    except Exception:
-        st.error("Invalid expression")
-        
-
-    # reorder picks first
-    df_pretty      = pd.concat([view.df_pretty[view.df_pretty["TopPick"]], view.df_pretty[~view.df_pretty["TopPick"]]]).reset_index(drop=True)
-    df_pretty = df_pretty.fillna("N/A")
-    # session state for selection
-    if "sel_ticker" not in st.session_state:
-        st.session_state.sel_ticker = df_pretty["Ticker"].iat[0]
-
-    # render grid
-    st.subheader("📋 Watchlist (click a row)")
-    r = WatchlistGrid(df_pretty)
-    grid = r.build_grid(col_state=st.session_state.get("watchlist_col_state"))
-    selected = grid.get("selected_rows", [])
-
-    if selected is not None and len(selected) > 0:
-        if len(selected) > 1:
-            selected = [selected[-1]]
-        st.session_state.sel_ticker = selected["Ticker"].iloc[0]
-
-    #top picks button
-    top_picks = df[df["TopPick"] == True]["Ticker"].tolist()
-    if top_picks:
-        if st.button("📄 Export filtered rows to TXT"):
-            os.makedirs("output", exist_ok=True)
-
-            # Find next available filename
-            base_name = "top_picks"
-            existing = os.listdir("output")
-            nums = [
-                int(match.group(1))
-                for f in existing
-                if (match := re.match(rf"{base_name}(\d*)\.txt", f)) and match.group(1)
-            ]
-            next_num = max(nums, default=0) + 1
-            filename = f"{base_name}{next_num if next_num > 1 else ''}.txt"
-            file_path = os.path.join("output", filename)
-
-            with open(file_path, "w") as f:
-                for t in top_picks:
-                    f.write(f"{t}\n")
-
-            st.success(f"✅ Exported {len(top_picks)} tickers to {file_path}")
+@timed_fragment("chart")
+def chart_panel():
     #Chart
     st.subheader(f"📈 {st.session_state.sel_ticker}")
     if "timeframe" not in st.session_state:
@@ -402,7 +456,7 @@ with col1:
     )
     if timeframe != st.session_state.timeframe:
         st.session_state.timeframe = timeframe
-        st.rerun()
+        st.rerun(scope="fragment")
     if "show_intraday" not in st.session_state:
         st.session_state["show_intraday"] = True
     if "last_tf" not in st.session_state or st.session_state.last_tf != timeframe:
@@ -448,22 +502,11 @@ with col1:
     }
     try:
         ticker = st.session_state.sel_ticker
-        hist = yf.Ticker(ticker).history(period=timeframe)
-
-        if not hist.empty:
-            if timeframe == "1d":
-                # Use previous close if available
-                prev_close = yf.Ticker(ticker).info.get("previousClose")
-                last_price = hist["Close"].iloc[-1]
-                if prev_close:
-                    pct_change = round((last_price - prev_close) / prev_close * 100, 2)
-                else:
-                    pct_change = 0.0
-            else:
-                start_price = hist["Close"].iloc[0]
-                end_price = hist["Close"].iloc[-1]
-                pct_change = round((end_price - start_price) / start_price * 100, 2)
+        chart = Chart(ticker, timeframe, intra, polygon_key, indicators=indicators, width_px=chart_width)
+        data = chart.data()  # one cached fetch feeds both the % change and the figure
 
+        if isinstance(data, dict) and data["pct_change"] is not None:
+            pct_change = data["pct_change"]
             change_color = "green" if pct_change > 0 else "red" if pct_change < 0 else "gray"
             st.markdown(f"**% Change ({timeframe}):** <span style='color:{change_color}'>{pct_change:+.2f}%</span>", unsafe_allow_html=True)
 
@@ -471,7 +514,7 @@ with col1:
         if timeframe == "1d" and not intra and us_now.weekday() >= 5:
             st.info("📅 It's the weekend, after hours unavailable.")
         else:
-            fig = Chart(ticker, timeframe, intra, polygon_key, indicators=indicators).figure()
+            fig = chart.figure()
 
             if isinstance(fig, tuple) and fig[0] == "polygon_error":
                 code = fig[1]
@@ -484,48 +527,74 @@ with col1:
             else:
                 st.plotly_chart(fig, use_container_width=True)
 
+        prefetcher.prefetch(st.session_state.get("prefetch_candidates", []), timeframe, intra, polygon_key)
+
     except Exception as e:
         st.error(f"Could not load chart: {e}")
 
+
+@timed_fragment("picks grid")
+def multichart_panel():
+    top_picks = st.session_state.get("top_picks", [])
+    if not top_picks or not st.checkbox(f"🗂 Show TopPicks grid ({min(len(top_picks), MAX_TICKERS)} charts)", key="show_multichart"):
+        return
+    fig = small_multiples(top_picks)
+    if fig is None:
+        st.info("No intraday data for the current TopPicks.")
+    else:
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@timed_fragment("news")
+def news_panel():
     # 🧠 AI NEWS
     with st.expander("🧠 Ticker News", expanded=True):
-        if has_alpha:
-            news = get_news(st.session_state.sel_ticker, limit=news_limit, alpha_api=alpha_key)
-            if not news:
-                st.info("No news found for this ticker.")
-            else:
-                def sentiment_color(sentiment):
-                    if sentiment == "positive":
-                        return "green"
-                    elif sentiment == "negative":
-                        return "red"
-                    else:
-                        return "gray"
-
-                for item in news:
-                    color = sentiment_color(item["sentiment"].lower())
-                    st.markdown(f"""
-                <div style="margin-bottom:0.75rem;">
-                    <span style="font-size:14px;">
-                        📄 <a href="{item['url']}" target="_blank" style="color:#339CFF; text-decoration:none; font-weight:600;">
-                        {item['title']}
-                        </a><br>
-                        <span style="font-size:12px;">
-                            <span style="color:gray;">🕒 {item['timestamp']}</span>
-                            Sentiment: <span style="color:{color}; font-weight:500;">{item['sentiment'].lower()}</span>
-                            Confidence: <span style="color:{color}; font-weight:500;">{item['confidence']}</span>
-                        </span>
-                    </span>
-                </div>
-                """, unsafe_allow_html=True)
-
+        query = st.text_input("🔎 Search stored headlines (all tickers)", key="news_search")
+        if query:
+            news = search_news(query, limit=20)
+            empty_msg = "No stored headlines match your search."
         else:
+            # the news store, refreshed live when news_daemon.py hasn't covered this ticker recently
+            news = ticker_news(st.session_state.sel_ticker, news_limit, alpha_key if has_alpha else None)
+            empty_msg = "No news found for this ticker."
+
+        if not news and not query and not has_alpha:
             st.markdown(
                 "⚠️ <span style='color:orange'>Add your AlphaVantage API key in config.yaml to enable news</span>",
                 unsafe_allow_html=True
             )
+        elif not news:
+            st.info(empty_msg)
+        else:
+            def sentiment_color(sentiment):
+                if sentiment == "positive":
+                    return "green"
+                elif sentiment == "negative":
+                    return "red"
+                else:
+                    return "gray"
+
+            for item in news:
+                color = sentiment_color(item["sentiment"].lower())
+                st.markdown(f"""
+            <div style="margin-bottom:0.75rem;">
+                <span style="font-size:14px;">
+                    📄 <a href="{item['url']}" target="_blank" style="color:#339CFF; text-decoration:none; font-weight:600;">
+                    {item['title']}
+                    </a><br>
+                    <span style="font-size:12px;">
+                        <span style="color:gray;">🕒 {item['timestamp']}</span>
+                        Sentiment: <span style="color:{color}; font-weight:500;">{item['sentiment'].lower()}</span>
+                        Confidence: <span style="color:{color}; font-weight:500;">{item['confidence']}</span>
+                    </span>
+                </span>
+            </div>
+            """, unsafe_allow_html=True)
 
 
+
+@timed_fragment("auto-refresh")
+def autorefresh_panel():
     # —— Auto-Refresh Interval ——
     st.markdown("#### Auto-Refresh Interval")
     c1, c2, c3 = st.columns([1, 1, 2])
@@ -541,23 +610,33 @@ with col1:
     total_secs = int(hrs) * 3600 + int(mns) * 60
     if total_secs <= 0:
         c3.write("**Next refresh:** (auto-refresh off)")
-        refresh_count = st.session_state.get("refresh_counter")  # do not trigger
-    else:
-        interval_ms = max(total_secs * 1000, 1000)  # floor at 1s to prevent thrash
-        next_run = datetime.now() + timedelta(seconds=total_secs)
-        c3.write(f"**Next refresh:** {next_run.strftime('%b %d, %Y %H:%M:%S')}")
+        return
+    interval_ms = max(total_secs * 1000, 1000)  # floor at 1s to prevent thrash
+    next_run = datetime.now() + timedelta(seconds=total_secs)
+    c3.write(f"**Next refresh:** {next_run.strftime('%b %d, %Y %H:%M:%S')}")
     refresh_count = st_autorefresh(interval=interval_ms, limit=None, key="refresh_counter")
     last_count = st.session_state.get("last_refresh_counter")
-    if refresh_count != last_count and total_secs > 0:
-        st.session_state["refresh_snapshot"] = _moves_snapshot(_df_for_snapshot)
+    if last_count is None:
         st.session_state["last_refresh_counter"] = refresh_count
+    elif refresh_count != last_count:
+        # baseline for the moves columns = what was on screen until now, then reload everything
+        st.session_state["refresh_snapshot"] = _moves_snapshot(df)
+        st.session_state["last_refresh_counter"] = refresh_count
+        st.rerun()
 
 
-with col2:
-    picks = YamlPicks(filters, df).get()
-    if picks:
-        for ticker, reasons in picks.items():
-            st.markdown(f"<span style='color:gold'><strong>{ticker}</strong>: {reasons}</span>", unsafe_allow_html=True)
-    else:
-        st.write("_No picks under YAML filters._")
-    show_alert_modal(view, config, d.wl)
\ No newline at end of file
+
+@timed_fragment("alerts")
+def alerts_panel():
+    show_alert_modal(WatchlistView(df), config, d.wl)
+
+
+screen_panel()
+left, right = st.columns([5, 4])
+with left:
+    chart_panel()
+    multichart_panel()
+    news_panel()
+    autorefresh_panel()
+with right:
+    alerts_panel()
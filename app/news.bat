@@ -0,0 +1,4 @@
+@echo off
+cd /d %~dp0
+python news_daemon.py
+pause
\ No newline at end of file
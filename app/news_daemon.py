@@ -0,0 +1,98 @@
+"""
+Background news ingestion: pulls AlphaVantage headlines for every watchlist ticker into
+data/news.db (FTS-indexed, with FinBERT sentiment) so the UI reads news instantly.
+
+AlphaVantage ANDs multi-ticker queries, so calls alternate between the market-wide
+latest feed (covers many tickers at once) and a round-robin over single tickers, paced
+to stay inside the daily quota.
+"""
+import time
+from datetime import datetime
+import yaml
+from core.alphavantage import fetch_news_feed
+from core.datafetch import load_all_tickers
+from core.newsstore import save_articles, known_urls, get_state, set_state, mark_ingested
+from core import sentiment
+from core.sentiment import score_headlines
+
+CONFIG_PATH = "config.yaml"
+
+def load_config():
+    with open(CONFIG_PATH, "r") as f:
+        return yaml.safe_load(f)
+
+def calls_today():
+    return int(get_state(f"calls:{datetime.now().date()}", 0))
+
+def count_call(n=1):
+    set_state(f"calls:{datetime.now().date()}", calls_today() + n)
+
+def next_ticker(universe):
+    cursor = int(get_state("cursor", 0))
+    set_state("cursor", cursor + 1)
+    return universe[cursor % len(universe)]
+
+def ingest(articles, universe):
+    """Keep articles tagged with a watchlist ticker, score the new ones, store them."""
+    wanted = set(universe)
+    kept = []
+    for a in articles:
+        a["tickers"] = {t: r for t, r in a["tickers"].items() if t in wanted}
+        if a["tickers"]:
+            kept.append(a)
+
+    seen = known_urls(a["url"] for a in kept)
+    fresh = [a for a in kept if a["url"] not in seen]
+    for a, s in zip(fresh, score_headlines([a["title"] for a in fresh])):
+        a["label"], a["score"] = s["label"], s["score"]
+    # known articles are still saved so new ticker tags get recorded
+    return save_articles(fresh + [a for a in kept if a["url"] in seen])
+
+def run_once(api_key, universe, market_every):
+    n = int(get_state("requests", 0))
+    set_state("requests", n + 1)
+    if n % market_every == 0:
+        label = "market feed"
+        articles, error = fetch_news_feed(api_key, limit=1000)
+    else:
+        label = next_ticker(universe)
+        articles, error = fetch_news_feed(api_key, tickers=label, limit=50)
+    count_call()
+
+    if error:
+        print(f"[News] {label}: {error}")
+        if "rate limit" in error.lower() or "premium" in error.lower():
+            return False  # out of quota for today
+        return True
+    if label != "market feed":
+        mark_ingested(label)  # the UI won't fetch this ticker live for a while
+    new = ingest(articles, universe)
+    print(f"[News] {label}: {len(articles)} articles, {new} new")
+    return True
+
+def main():
+    config = load_config()
+    api_key = config.get("api_keys", {}).get("alpha")
+    if not api_key or api_key == "YOUR_API_KEY_HERE":
+        print("[News] Add your AlphaVantage API key in config.yaml first.")
+        return
+    sentiment.configure(config.get("sentiment"))
+    cfg = config.get("news") or {}
+    quota = int(cfg.get("daily_quota", 25))
+    market_every = max(1, int(cfg.get("market_every", 3)))
+    interval = max(60, 86400 / quota)  # spread the quota over the day
+    print(f"[News] Starting news daemon, {quota} calls/day, one every {interval / 60:.0f} min")
+
+    while True:
+        try:
+            universe = load_all_tickers()
+            if calls_today() >= quota:
+                print(f"[News] Daily quota used ({quota}), waiting")
+            elif universe and not run_once(api_key, universe, market_every):
+                count_call(quota)  # the API says we're done for today
+        except Exception as e:
+            print(f"[News Error] {e}")
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+@echo off
+cd /d %~dp0
+python precompute.py
+pause
\ No newline at end of file
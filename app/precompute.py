@@ -0,0 +1,52 @@
+"""
+End-of-day job: precompute per-ticker seed states (previous close, 20d volume, RSI/MACD
+smoothing state) and slow-moving info into data/baselines.db. Intraday refreshes combine
+these with live quotes instead of re-downloading history and infos.
+
+Run after the close, e.g. from Task Scheduler: precompute.bat
+Optional args: watchlist .txt files to limit the universe (default: all watchlists)
+"""
+import sys
+import pandas as pd
+from datetime import datetime
+import pytz
+from core.datafetch import fetch_batch_history, fetch_infos_parallel, load_all_tickers, is_market_open
+from core.indicators import seed_state
+from core.baselines import save_baselines
+
+def load_tickers(paths):
+    if not paths:
+        return load_all_tickers()
+    tickers = set()
+    for path in paths:
+        with open(path) as f:
+            tickers.update(line.split("#")[0].strip().upper() for line in f)
+    return sorted(t for t in tickers if t)
+
+def main():
+    tickers = load_tickers(sys.argv[1:])
+    print(f"[Precompute] {len(tickers)} tickers")
+
+    hist_all = fetch_batch_history(tickers)
+    info_map = fetch_infos_parallel(tickers)
+    today = datetime.now(pytz.timezone("US/Eastern")).date()
+
+    states = {}
+    for tkr in tickers:
+        try:
+            h = hist_all.get(tkr) if isinstance(hist_all.columns, pd.MultiIndex) else hist_all
+            h = h.dropna(subset=["Close"]) if h is not None else None
+            if h is not None and is_market_open():
+                h = h[h.index.date < today]  # today's bar is still moving
+            if h is None or h.empty:
+                print(f"[SKIP] No data for {tkr}")
+                continue
+            states[tkr] = seed_state(h)
+        except Exception as e:
+            print(f"[ERROR] {tkr}: {e}")
+
+    n = save_baselines(states, info_map)
+    print(f"[Precompute] Saved {n} baselines. {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+if __name__ == "__main__":
+    main()
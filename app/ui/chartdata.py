@@ -0,0 +1,105 @@
+import threading
+import time
+from core.datafetch import is_market_open
+from core.ratelimit import upstream
+from core.singleflight import single_flight
+from ui.polygon import get_polygon
+
+def chart_ttl():
+    return 60 if is_market_open() else 3600
+
+def _yahoo_bars(ticker, timeframe):
+    """Bars for the chart plus the close the % change is measured against."""
+    import yfinance as yf
+    upstream["yahoo"].take()
+    tk = yf.Ticker(ticker)
+    if timeframe == "1d":
+        # two sessions of minute bars: the chart shows the last one, the one before gives the previous close
+        h = tk.history(period="2d", interval="1m")
+        if h.empty:
+            return h, None
+        days = h.index.date
+        last = h[days == days[-1]]
+        prior = h[days != days[-1]]
+        return last, (prior["Close"].iloc[-1] if not prior.empty else None)
+    if timeframe == "5d":
+        h = tk.history(period="5d", interval="15m")
+    elif timeframe == "All":
+        h = tk.history(period="max")
+    else:
+        h = tk.history(period=timeframe.lower())
+    return h, (h["Close"].iloc[0] if not h.empty else None)
+
+def _polygon_bars(ticker, timeframe, api_key):
+    bars = get_polygon(ticker, timeframe, api_key)
+    if isinstance(bars, tuple) and bars[0] == "polygon_error":
+        return bars, None
+    if bars is None or bars.empty:
+        return ("polygon_error", "empty"), None
+    if timeframe != "1d":
+        return bars, bars["Close"].iloc[0]
+    # previous close = last regular-session bar of the prior day (bars include extended hours)
+    days = bars.index.date
+    prior = bars[(days != days[-1]) & (bars.index.hour < 16)]
+    return bars, (prior["Close"].iloc[-1] if not prior.empty else bars["Close"].iloc[0])
+
+@single_flight
+def load_chart_data(ticker, timeframe, polygon_key=None):
+    if polygon_key:
+        bars, ref = _polygon_bars(ticker, timeframe, polygon_key)
+    else:
+        bars, ref = _yahoo_bars(ticker, timeframe)
+    if isinstance(bars, tuple):
+        return bars
+
+    pct_change = None
+    if ref and not bars.empty:
+        pct_change = round((bars["Close"].iloc[-1] - ref) / ref * 100, 2)
+    return {"bars": bars, "prev_close": ref, "pct_change": pct_change, "fetched": time.time()}
+
+class ChartDataCache:
+    """
+    TTL cache of chart data per (ticker, timeframe, source). Plain dict + lock rather than
+    st.cache_data so background threads (prefetch) can fill it too. Errors aren't cached.
+    """
+    def __init__(self, ttl=chart_ttl, size=256):
+        self.ttl = ttl
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, ticker, timeframe, intraday=True, polygon_key=None):
+        # Polygon only serves the extended-hours 1d/5d charts
+        if intraday or timeframe not in ("1d", "5d"):
+            polygon_key = None
+        key = (ticker, timeframe, polygon_key)
+
+        with self.lock:
+            data = self.entries.get(key)
+        if data is not None and time.time() - data["fetched"] <= self.ttl():
+            return data
+
+        data = load_chart_data(ticker, timeframe, polygon_key)
+        if isinstance(data, dict):
+            with self.lock:
+                self.entries[key] = data
+                if len(self.entries) > self.size:
+                    oldest = min(self.entries, key=lambda k: self.entries[k]["fetched"])
+                    del self.entries[oldest]
+        return data
+
+    def has(self, ticker, timeframe, intraday=True, polygon_key=None):
+        if intraday or timeframe not in ("1d", "5d"):
+            polygon_key = None
+        with self.lock:
+            data = self.entries.get((ticker, timeframe, polygon_key))
+        return data is not None and time.time() - data["fetched"] <= self.ttl()
+
+chart_cache = ChartDataCache()
+
+def get_chart_data(ticker, timeframe, intraday=True, polygon_key=None):
+    """
+    Bars, previous close and % change for one chart from a single cached fetch.
+    Returns ("polygon_error", code) if the Polygon request failed.
+    """
+    return chart_cache.get(ticker, timeframe, intraday, polygon_key)
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+class Ema:
+    """EMA with the previous value as its state (same numbers as ta's EMAIndicator)."""
+    def __init__(self, window=9):
+        self.window = window
+        self.col = f"EMA_{window}"
+        self.warmup = 1
+
+    def _show(self, ema, start):
+        return np.where(np.arange(start, start + len(ema)) >= self.window - 1, ema, np.nan)
+
+    def full(self, bars):
+        ema = bars["Close"].ewm(span=self.window, adjust=False).mean().to_numpy()
+        return pd.DataFrame({"_ema": ema, self.col: self._show(ema, 0)}, index=bars.index)
+
+    def extend(self, prev, bars, k):
+        a = 2 / (self.window + 1)
+        ema = np.empty(len(bars) - k)
+        last = prev["_ema"].iat[-1]
+        for i, c in enumerate(bars["Close"].to_numpy(dtype=float)[k:]):
+            last = a * c + (1 - a) * last
+            ema[i] = last
+        return pd.DataFrame({"_ema": ema, self.col: self._show(ema, k)}, index=bars.index[k:])
+
+class Bollinger:
+    """Bollinger Bands; the state is just the last window-1 closes."""
+    def __init__(self, window=20, dev=2):
+        self.window = window
+        self.dev = dev
+        self.warmup = window - 1
+
+    def full(self, bars):
+        close = bars["Close"]
+        mid = close.rolling(self.window, min_periods=self.window).mean()
+        std = close.rolling(self.window, min_periods=self.window).std(ddof=0)
+        return pd.DataFrame({"bb_upper": mid + self.dev * std, "bb_lower": mid - self.dev * std}, index=bars.index)
+
+    def extend(self, prev, bars, k):
+        window = bars["Close"].to_numpy(dtype=float)[k - (self.window - 1):]
+        roll = np.lib.stride_tricks.sliding_window_view(window, self.window)
+        mid, std = roll.mean(axis=1), roll.std(axis=1)
+        return pd.DataFrame({"bb_upper": mid + self.dev * std, "bb_lower": mid - self.dev * std}, index=bars.index[k:])
+
+class SessionVwap:
+    """VWAP that restarts every session; the state is the running price*volume and volume sums."""
+    warmup = 1
+
+    def _run(self, bars, pv0=0.0, vol0=0.0, sess0=None):
+        close = bars["Close"].to_numpy(dtype=float)
+        vol = bars["Volume"].to_numpy(dtype=float)
+        sess = bars["_session"].to_numpy()
+        first = np.r_[True, sess[1:] != sess[:-1]]
+        group = np.cumsum(first) - 1
+        starts = np.flatnonzero(first)
+
+        cpv, cvol = np.cumsum(close * vol), np.cumsum(vol)
+        # subtract what was accumulated before each session started
+        base_pv = np.r_[0.0, cpv][starts][group]
+        base_vol = np.r_[0.0, cvol][starts][group]
+        cum_pv, cum_vol = cpv - base_pv, cvol - base_vol
+        if len(sess) and sess[0] == sess0:
+            # first rows continue the session already in progress
+            cont = group == 0
+            cum_pv[cont] += pv0
+            cum_vol[cont] += vol0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = cum_pv / cum_vol
+        return pd.DataFrame({"_cum_pv": cum_pv, "_cum_vol": cum_vol, "_session": sess, "VWAP": vwap}, index=bars.index)
+
+    def full(self, bars):
+        return self._run(bars)
+
+    def extend(self, prev, bars, k):
+        return self._run(bars.iloc[k:], prev["_cum_pv"].iat[-1], prev["_cum_vol"].iat[-1], prev["_session"].iat[-1])
+
+INDICATORS = {
+    "ema9": Ema(9),
+    "vwap": SessionVwap(),
+    "bbands": Bollinger(20, 2),
+}
+
+class ChartState:
+    """
+    Bars + per-indicator state per (ticker, timeframe, source).
+
+    A rerun whose bars end on the same timestamp/close/volume as last time reuses
+    everything (that's the memo key). Otherwise only rows from the first new or changed
+    bar (the last bar is usually still forming) are computed, each indicator carrying
+    on from its own state. Indicators are only computed while they're switched on; a
+    hidden one keeps its state and catches up when it's turned back on.
+    """
+    def __init__(self, size=32):
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> {"bars", "cols": {indicator: frame}}
+
+    def update(self, key, bars: pd.DataFrame, indicators=(), sessions=False) -> pd.DataFrame:
+        """bars (Close, Volume) with the columns of the requested indicators."""
+        bars = bars[["Close", "Volume"]].dropna()
+        # intraday charts: one VWAP session per calendar day; daily bars: anchored at the first bar
+        sess = bars.index.normalize().asi8 if sessions and isinstance(bars.index, pd.DatetimeIndex) else np.zeros(len(bars), dtype=np.int64)
+        bars = bars.assign(_session=sess)
+
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            entry = self._sync(entry, bars)
+            for name in indicators:
+                self._compute(entry, name)
+            self.entries[key] = entry
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+        out = entry["bars"]
+        extra = [entry["cols"][n].drop(columns=[c for c in entry["cols"][n] if c.startswith("_")]) for n in indicators]
+        return pd.concat([out[["Close", "Volume"]]] + extra, axis=1) if extra else out[["Close", "Volume"]]
+
+    def _sync(self, entry, bars):
+        """Swap in the new bars, truncating indicator state to the rows that didn't change."""
+        if entry is None or bars.empty or entry["bars"].empty or bars.index[0] != entry["bars"].index[0]:
+            return {"bars": bars, "cols": {}}  # nothing to build on, or the window start moved
+
+        old = entry["bars"]
+        if len(old) == len(bars) and old.index[-1] == bars.index[-1] and \
+                old["Close"].iat[-1] == bars["Close"].iat[-1] and old["Volume"].iat[-1] == bars["Volume"].iat[-1]:
+            return entry  # memo hit: same last bar, nothing changed
+
+        n = min(len(old), len(bars))
+        same = (old.index[:n] == bars.index[:n]) & \
+               (old["Close"].to_numpy()[:n] == bars["Close"].to_numpy()[:n]) & \
+               (old["Volume"].to_numpy()[:n] == bars["Volume"].to_numpy()[:n]) & \
+               (old["_session"].to_numpy()[:n] == bars["_session"].to_numpy()[:n])
+        k = n if same.all() else int(np.argmin(same))
+        cols = {name: c.iloc[:min(k, len(c))] for name, c in entry["cols"].items()}
+        return {"bars": bars, "cols": cols}
+
+    def _compute(self, entry, name):
+        ind = INDICATORS[name]
+        bars = entry["bars"]
+        have = entry["cols"].get(name)
+        k = 0 if have is None else len(have)
+        if k == len(bars):
+            return
+        if k < ind.warmup:
+            entry["cols"][name] = ind.full(bars)
+            return
+        entry["cols"][name] = pd.concat([have, ind.extend(have, bars, k)])
+        print(f"[ChartState] {name}: +{len(bars) - k} bars")
+
+chart_state = ChartState()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+def _x(index):
+    # timestamps -> float seconds so triangle areas are well scaled
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float) / 1e9
+    return np.arange(len(index), dtype=float)
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-triangle-three-buckets: positions of the n_out points that best keep the
+    shape of y(x). First and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # n_out - 2 buckets between the end points
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point) is the third triangle corner
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+def lttb(series: pd.Series, n_out: int) -> pd.Series:
+    """series (NaNs dropped) reduced to at most n_out points with LTTB."""
+    s = series.dropna()
+    if len(s) <= n_out:
+        return s
+    return s.iloc[lttb_indices(_x(s.index), s.to_numpy(dtype=float), n_out)]
+
+def max_buckets(series: pd.Series, n_out: int) -> pd.Series:
+    """One bar per bucket: the largest, so volume spikes survive."""
+    s = series.dropna()
+    if len(s) <= n_out:
+        return s
+    v = s.to_numpy(dtype=float)
+    starts = np.linspace(0, len(s), n_out + 1).astype(int)[:-1]
+    # peak per bucket, then the first position in the bucket holding it
+    peaks = np.maximum.reduceat(v, starts)
+    pos = [lo + int(np.argmax(v[lo:hi] == p)) for lo, hi, p in zip(starts, np.append(starts[1:], len(v)), peaks)]
+    return s.iloc[pos]
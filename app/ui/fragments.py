@@ -0,0 +1,16 @@
+import functools
+import time
+import streamlit as st
+
+def timed_fragment(name):
+    """st.fragment that logs how long each (re)run of the panel takes."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                print(f"[Timing] {name}: {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return st.fragment(run)
+    return deco
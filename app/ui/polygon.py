@@ -1,12 +1,108 @@
+import os
+import threading
 import requests
 import pandas as pd
+import pyarrow as pa
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
-import streamlit as st
+from core.ratelimit import upstream
+
+POLYGON_DIR = "data/polygon"
+KEEP_DAYS = 7  # minute bars older than this are dropped from the cache files
+
+# one pooled session for all Polygon calls (keep-alive instead of a new TLS handshake per request)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+_lock = threading.Lock()
+_locks = {}   # ticker -> lock, so 1d and 5d for the same ticker don't both fetch
+_bars = {}    # ticker -> cached minute bars (in memory copy of the .arrow file)
+_covered = {} # ticker -> ms from which the cache holds every bar (bars can start hours later)
+
+def _ticker_lock(ticker):
+    with _lock:
+        return _locks.setdefault(ticker, threading.Lock())
+
+def _path(ticker):
+    return os.path.join(POLYGON_DIR, f"{ticker}.arrow")
+
+def _load(ticker):
+    if ticker not in _bars:
+        df, covered = pd.DataFrame(), None
+        if os.path.exists(_path(ticker)):
+            try:
+                with pa.memory_map(_path(ticker), "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                df = table.to_pandas()
+                meta = table.schema.metadata or {}
+                if b"covered_from" in meta:
+                    covered = int(meta[b"covered_from"])
+            except Exception as e:
+                print(f"[Polygon] Ignoring unreadable cache for {ticker}: {e}")
+        _bars[ticker], _covered[ticker] = df, covered
+    return _bars[ticker], _covered[ticker]
+
+def _save(ticker, df, covered_from):
+    os.makedirs(POLYGON_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"covered_from": str(covered_from).encode()})
+    tmp = f"{_path(ticker)}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    try:
+        os.replace(tmp, _path(ticker))
+    except PermissionError as e:
+        print(f"[Polygon] Cache write skipped for {ticker}: {e}")
+
+def _fetch_range(ticker, start_ms, end_ms, api_key):
+    """All minute aggs in [start_ms, end_ms], following next_url past the 50k page limit."""
+    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start_ms}/{end_ms}"
+    params = {"adjusted": "true", "sort": "asc", "limit": 50000, "apiKey": api_key}
+    rows = []
+    while url:
+        upstream["polygon"].take()
+        r = session.get(url, params=params, timeout=15)
+        r.raise_for_status()
+        data = r.json()
+        rows += data.get("results", [])
+        url = data.get("next_url")
+        params = {"apiKey": api_key}  # next_url already carries the query, minus the key
+    df = pd.DataFrame(rows, columns=["t", "c", "v"])
+    return df.astype({"t": "int64", "c": float, "v": float})
+
+def _update(ticker, since_ms, api_key):
+    """Fetch only the minutes after the last cached bar and merge them in."""
+    cached, covered_from = _load(ticker)
+    now_ms = int(datetime.now().timestamp() * 1000)
+    if not cached.empty and covered_from is not None and covered_from <= since_ms:
+        # re-ask for the last bar too, it may have been partial when we got it
+        start_ms = int(cached["t"].iloc[-1])
+    else:
+        # the first bar is pre-market, hours after since_ms, so coverage is tracked separately
+        cached = pd.DataFrame()
+        start_ms = covered_from = since_ms
+
+    fresh = _fetch_range(ticker, start_ms, now_ms, api_key)
+    merged = pd.concat([cached, fresh], ignore_index=True) if not cached.empty else fresh
+    merged = merged.drop_duplicates("t", keep="last").sort_values("t", ignore_index=True)
+    keep_from = now_ms - KEEP_DAYS * 86400 * 1000
+    merged = merged[merged["t"] >= keep_from].reset_index(drop=True)
+    covered_from = max(covered_from, keep_from)
+    print(f"[Polygon] {ticker}: +{len(fresh)} bars ({len(merged)} cached)")
+
+    _bars[ticker], _covered[ticker] = merged, covered_from
+    _save(ticker, merged, covered_from)
+    return merged
+
 def get_polygon(ticker, timeframe, api_key):
     """
     Fetch full intraday data (pre-market, regular, post-market) from Polygon.io.
     Supports "1d" and "5d" timeframes.
 
+    Minute bars are cached per ticker in data/polygon/<ticker>.arrow; each call only
+    downloads the bars after the last cached one.
+
     Returns DataFrame with datetime index (US/Eastern), and ["Close", "Volume"] columns.
     """
     now = datetime.now()
@@ -18,45 +114,37 @@ def get_polygon(ticker, timeframe, api_key):
     else:
         return pd.DataFrame()
 
-    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start.strftime('%Y-%m-%d')}/{now.strftime('%Y-%m-%d')}"
-    params = {
-        "adjusted": "true",
-        "sort": "asc",
-        "limit": 10000,
-        "apiKey": api_key,
-    }
+    # same window as before: from the start of that calendar day
+    since_ms = int(datetime(start.year, start.month, start.day).timestamp() * 1000)
 
-    try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json().get("results", [])
-        if not data:
-            return pd.DataFrame()
+    with _ticker_lock(ticker):
+        try:
+            bars = _update(ticker, since_ms, api_key)
 
-        df = pd.DataFrame(data)
-        df["t"] = pd.to_datetime(df["t"], unit="ms")
-        df.set_index("t", inplace=True)
-        df.rename(columns={"c": "Close", "v": "Volume"}, inplace=True)
+        except requests.exceptions.HTTPError as e:
+            # Catch HTTP errors like 401/403/429 explicitly
+            try:
+                status_code = e.response.status_code
+            except:
+                status_code = "unknown_http"
+            print(f"[Polygon Error] {e} (status {status_code})")
+            return ("polygon_error", status_code)
 
-        # Convert UTC to US/Eastern for proper market-time display
-        df.index = df.index.tz_localize("UTC").tz_convert("US/Eastern")
+        except requests.exceptions.RequestException as e:
+            # Catch broader request exceptions
+            print(f"[Polygon Error] Request failure: {e}")
+            return ("polygon_error", "request_exception")
 
-        return df[["Close", "Volume"]]
+        except Exception as e:
+            print(f"[Polygon Error] {e}")
+            return ("polygon_error", "unknown")
 
-    except requests.exceptions.HTTPError as e:
-        # Catch HTTP errors like 401/403/429 explicitly
-        try:
-            status_code = e.response.status_code
-        except:
-            status_code = "unknown_http"
-        print(f"[Polygon Error] {e} (status {status_code})")
-        return ("polygon_error", status_code)
-
-    except requests.exceptions.RequestException as e:
-        # Catch broader request exceptions
-        print(f"[Polygon Error] Request failure: {e}")
-        return ("polygon_error", "request_exception")
-
-    except Exception as e:
-        print(f"[Polygon Error] {e}")
-        return ("polygon_error", "unknown")
\ No newline at end of file
+    bars = bars[bars["t"] >= since_ms]
+    if bars.empty:
+        return pd.DataFrame()
+
+    df = pd.DataFrame({"Close": bars["c"].to_numpy(), "Volume": bars["v"].to_numpy()},
+                      index=pd.to_datetime(bars["t"].to_numpy(), unit="ms"))
+    # Convert UTC to US/Eastern for proper market-time display
+    df.index = df.index.tz_localize("UTC").tz_convert("US/Eastern")
+    return df
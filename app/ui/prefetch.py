@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.ratelimit import TokenBucket
+from ui.chartdata import chart_cache
+
+class ChartPrefetcher:
+    """
+    Warms the chart data cache for the tickers the user is likely to click next.
+    A small thread pool does the fetching. Every fetch already draws from the shared
+    per-upstream budget (core.ratelimit); on top of that prefetching gets its own, much
+    smaller share so it leaves most of the budget to the charts the user clicks.
+    """
+    def __init__(self, workers=3, max_tickers=20, rates=None):
+        self.workers = workers
+        self.max_tickers = max_tickers
+        self.buckets = {src: TokenBucket(r) for src, r in (rates or {"yahoo": 1.0, "polygon": 1 / 60}).items()}
+        self.pool = None
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.wanted = set()  # keys from the latest prefetch() call; older queued work is dropped
+
+    def configure(self, cfg):
+        cfg = cfg or {}
+        self.workers = cfg.get("workers", self.workers)
+        self.max_tickers = cfg.get("max_tickers", self.max_tickers)
+        for src, r in (cfg.get("rate") or {}).items():
+            # update in place: this runs on every rerun and must not hand out a fresh burst
+            if src in self.buckets:
+                self.buckets[src].set_rate(float(r))
+            else:
+                self.buckets[src] = TokenBucket(float(r))
+
+    def prefetch(self, tickers, timeframe, intraday=True, polygon_key=None):
+        """Queue chart fetches for tickers (most likely first) that aren't cached yet."""
+        keys = []
+        for t in list(dict.fromkeys(tickers))[:self.max_tickers]:
+            if not chart_cache.has(t, timeframe, intraday, polygon_key):
+                keys.append((t, timeframe, intraday, polygon_key))
+
+        with self.lock:
+            self.wanted = set(keys)
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chart-prefetch")
+            new = [k for k in keys if k not in self.pending]
+            self.pending.update(new)
+        for k in new:
+            self.pool.submit(self._run, k)
+        if new:
+            print(f"[Prefetch] Queued {len(new)} charts ({timeframe})")
+        return len(new)
+
+    def _run(self, key):
+        ticker, timeframe, intraday, polygon_key = key
+        try:
+            with self.lock:
+                if key not in self.wanted:
+                    return  # selection moved on before we got to it
+            if chart_cache.has(*key):
+                return
+            uses_polygon = polygon_key and not intraday and timeframe in ("1d", "5d")
+            bucket = self.buckets.get("polygon" if uses_polygon else "yahoo")
+            if bucket:
+                bucket.take()
+            chart_cache.get(*key)
+        except Exception as e:
+            print(f"[Prefetch] {ticker} {timeframe} failed: {e}")
+        finally:
+            with self.lock:
+                self.pending.discard(key)
+
+prefetcher = ChartPrefetcher()
+
+def prefetch_candidates(tickers, selected, top_picks=(), alerted=(), around=2):
+    """Likely next selections, best first: rows next to the selection, TopPicks, alerted tickers."""
+    tickers = list(tickers)
+    near = []
+    if selected in tickers:
+        i = tickers.index(selected)
+        for d in range(1, around + 1):
+            near += [tickers[j] for j in (i + d, i - d) if 0 <= j < len(tickers)]
+    return [t for t in dict.fromkeys(near + list(top_picks) + list(alerted)) if t != selected]